@@ -5,15 +5,23 @@ Uses search.usa.gov JSON API (no HTML scraping) for reliable results.
 """
 
 from fastapi import FastAPI, HTTPException, Query, Body, Request
-from fastapi.responses import PlainTextResponse, Response, JSONResponse, FileResponse
+from fastapi.responses import PlainTextResponse, Response, JSONResponse, FileResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Union, Callable
 from datetime import datetime
-import logging, requests, asyncio, re, os
-from bs4 import BeautifulSoup
+import logging, requests, httpx, asyncio, re, os, hashlib, threading
+import orjson
+from collections import OrderedDict
+from itertools import islice
+from cachetools import LRUCache, TTLCache, cached
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import lxml.html
+from lxml import etree
+from lxml.html import HtmlElement as LxmlElement
 import html2text as _html2text
 from urllib.parse import urlencode
 from concurrent.futures import ThreadPoolExecutor
@@ -30,7 +38,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="BVA Decision Search API",
     description="Search Board of Veterans' Appeals decisions via the search.usa.gov JSON API",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -40,30 +49,36 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-executor = ThreadPoolExecutor(max_workers=10)
+# Blocking upstream fetchers (case text, KnowVA, eCFR, Federal Register, CAVC)
+# mostly wait on the network, so size the pool for I/O concurrency rather
+# than CPU count. Override with EXECUTOR_MAX_WORKERS.
+EXECUTOR_MAX_WORKERS = int(os.environ.get("EXECUTOR_MAX_WORKERS", min(64, (os.cpu_count() or 4) * 8)))
+executor = ThreadPoolExecutor(max_workers=EXECUTOR_MAX_WORKERS)
 cavc_client = CavcClient()
 
 
+_reindex_task: Optional[asyncio.Task] = None
+# Set on shutdown; index_sources checks it between fetches and batches so a
+# reindex running on the executor stops instead of outliving the server.
+_shutdown_flag = threading.Event()
+
 @app.on_event("startup")
 async def _startup_rag_reindex():
     """Auto-reindex RAG on container startup (background task)."""
+    global _reindex_task
     async def _reindex():
-        import rag as _rag
-        from ingest import ingest_cfr_part3, ingest_cfr_part4, ingest_knowva
+        from ingest import index_sources
         api_url = os.environ.get("BVA_API_URL", "http://localhost:8001")
         loop = asyncio.get_running_loop()
         # Wait for server to be ready
         await asyncio.sleep(5)
         try:
-            all_chunks = []
-            all_chunks.extend(await loop.run_in_executor(executor, ingest_cfr_part4, api_url))
-            all_chunks.extend(await loop.run_in_executor(executor, ingest_cfr_part3, api_url))
-            all_chunks.extend(await loop.run_in_executor(executor, ingest_knowva, api_url))
-            indexed = _rag.add_chunks(all_chunks)
+            indexed = await loop.run_in_executor(
+                executor, lambda: index_sources(api_url, "all", stop=_shutdown_flag))
             logger.info(f"Startup RAG reindex complete: {indexed} chunks indexed")
         except Exception as e:
             logger.error(f"Startup RAG reindex failed: {e}")
-    asyncio.create_task(_reindex())
+    _reindex_task = asyncio.create_task(_reindex())
 
 # -------------------------------------------------------------------
 # Structured error model + exception classes
@@ -148,9 +163,13 @@ async def validation_error_handler(request: Request, exc: RequestValidationError
 
 
 USER_AGENT = "VetAI-BVA-API/2.0"
+# Accept-Encoding is left to requests/httpx: both advertise br only when the
+# brotli package (see requirements.txt) is installed to decode it.
+DEFAULT_HEADERS = {"User-Agent": USER_AGENT}
 REQUEST_TIMEOUT = 15
 SEARCH_BASE = "https://search.usa.gov/search.json"
 RESULTS_PER_PAGE = 20
+BATCH_SEARCH_CONCURRENCY = 8
 
 # KnowVA (Oracle Service Cloud) API constants
 KNOWVA_BASE = "https://www.knowva.ebenefits.va.gov/system/ws/v11"
@@ -179,6 +198,78 @@ FR_FIELDS = [
     "publication_date", "agencies", "html_url", "pdf_url",
     "cfr_references", "action", "dates", "effective_on", "comments_close_on",
 ]
+# Params shared by every VA documents.json query, as (key, value) pairs
+_FR_BASE_PARAMS = (("conditions[agencies][]", FR_VA_SLUG),) + tuple(("fields[]", f) for f in FR_FIELDS)
+
+# Transient upstream statuses worth retrying (sessions via urllib3, search via _search_get)
+_RETRY_STATUSES = (429, 502, 503, 504)
+
+# One keep-alive pool with urllib3-level retries, shared by the upstream sessions.
+# Transient 429/5xx are retried on the warm connection instead of failing the
+# whole request; raise_on_status=False lets raise_for_status() report the final one.
+_ADAPTER = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=64,
+    max_retries=Retry(
+        total=3, connect=3, read=2, backoff_factor=0.3,
+        status_forcelist=_RETRY_STATUSES,
+        allowed_methods=frozenset(["GET"]),
+        raise_on_status=False,
+    ),
+)
+
+def _make_session(headers: Dict[str, str]) -> requests.Session:
+    session = requests.Session()
+    session.headers.update(headers)
+    session.mount("https://", _ADAPTER)
+    session.mount("http://", _ADAPTER)
+    return session
+
+# search.usa.gov is the highest-fanout upstream (batch + extract queries), so it
+# runs on the event loop instead of holding an executor thread per request.
+# Created in the startup hook; _search_client() covers use before startup.
+_search_client: Optional[httpx.AsyncClient] = None
+
+def _make_search_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        headers=DEFAULT_HEADERS,
+        timeout=REQUEST_TIMEOUT,
+        # Pool limits must go on the transport; the client ignores its own
+        # limits= when a transport is passed in.
+        transport=httpx.AsyncHTTPTransport(
+            retries=3,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+        ),
+    )
+
+def _get_search_client() -> httpx.AsyncClient:
+    global _search_client
+    if _search_client is None or _search_client.is_closed:
+        _search_client = _make_search_client()
+    return _search_client
+
+@app.on_event("startup")
+async def _open_search_client():
+    _get_search_client()
+
+async def _search_get(url: str, retries: int = 3, backoff: float = 0.3) -> httpx.Response:
+    # httpx transport retries only cover connect failures; retry transient
+    # 429/5xx here like the urllib3 Retry on the requests sessions does.
+    for attempt in range(retries):
+        resp = await _get_search_client().get(url)
+        if resp.status_code not in _RETRY_STATUSES:
+            return resp
+        retry_after = resp.headers.get("retry-after", "")
+        delay = min(float(retry_after), 5.0) if retry_after.isdigit() else backoff * 2 ** attempt
+        logger.warning(f"search.usa.gov returned {resp.status_code}; retrying in {delay:.1f}s")
+        await asyncio.sleep(delay)
+    return await _get_search_client().get(url)
+
+# One pooled session per upstream host, reused across executor threads
+CASE_SESSION = _make_session(DEFAULT_HEADERS)
+KNOWVA_SESSION = _make_session(KNOWVA_HEADERS)
+ECFR_SESSION = _make_session(ECFR_HEADERS)
+FR_SESSION = _make_session(DEFAULT_HEADERS)
 
 # Part 4 diagnostic code lookup (eCFR search doesn't index rating criteria well)
 # Format: DC code -> (condition, CFR section, part, description)
@@ -256,6 +347,9 @@ for _dc, _info in DC_LOOKUP.items():
     for _word in _info["condition"].lower().replace("(", "").replace(")", "").split():
         _DC_BY_CONDITION.setdefault(_word, []).append(_dc)
 
+# Numeric sort key per DC so "10000" sorts after "9411"
+_DC_SORT_KEY: Dict[str, int] = {dc: int(re.sub(r"\D", "", dc) or 0) for dc in DC_LOOKUP}
+
 # Full year -> dc collection ID mapping (verified from BVA search dropdown)
 YEAR_DC_MAP: Dict[int, int] = {
     1992: 9133, 1993: 9134, 1994: 9135, 1995: 9136, 1996: 9137,
@@ -266,6 +360,11 @@ YEAR_DC_MAP: Dict[int, int] = {
     2017: 9158, 2018: 9159, 2019: 9160, 2020: 9161, 2021: 9162,
     2022: 9256, 2023: 9692, 2024: 10080, 2025: 10280,
 }
+# The map is fixed at runtime, so the /years payload and the range shown on /
+# are built once here
+_YEAR_MIN, _YEAR_MAX = min(YEAR_DC_MAP), max(YEAR_DC_MAP)
+_YEARS_RANGE_STR = f"{_YEAR_MIN} - {_YEAR_MAX}"
+_YEARS_SORTED = [{"year": y, "dc": dc} for y, dc in sorted(YEAR_DC_MAP.items())]
 
 # -------------------------------------------------------------------
 # Pydantic models
@@ -359,16 +458,21 @@ class KnowVASearchResponse(BaseModel):
     results: List[KnowVAArticleSummary]
 
 # 38 CFR models
+# The Title 38 TOC models are only built when the structure cache is filled,
+# so their validators are compiled on first use rather than at import.
 class CFRSection(BaseModel):
+    model_config = ConfigDict(defer_build=True)
     identifier: str
     label: str
 
 class CFRPart(BaseModel):
+    model_config = ConfigDict(defer_build=True)
     number: str
     label: str
     sections: List[CFRSection]
 
 class CFRStructureResponse(BaseModel):
+    model_config = ConfigDict(defer_build=True)
     title: int
     date: str
     parts: List[CFRPart]
@@ -406,6 +510,10 @@ class DiagnosticCode(BaseModel):
     section: str
     schedule: str
 
+class DiagnosticCodeBatchResponse(BaseModel):
+    results: List[DiagnosticCode]
+    not_found: List[str]
+
 # Federal Register models
 class FederalRegisterDocument(BaseModel):
     document_number: str
@@ -560,37 +668,53 @@ CFR_RE      = re.compile(r"38\s*CFR\s*[§\u00A7]\s*([\d\.]+[a-z0-9\(\)]*)", re.I
 M21_RE      = re.compile(r"M21-1[\w\-\.\s]*", re.I)
 RO_RE       = re.compile(r"Regional\s+Office\s+in\s+([A-Za-z\s,]+)", re.I)
 JUDGE_RE    = re.compile(r"(?:Veterans\s+Law\s+Judge|Acting\s+Veterans\s+Law\s+Judge)\s*[:\-]?\s*([A-Z][A-Za-z\s\-\.]+)")
-OUTCOME_PATTERNS = [
-    ("Granted",  re.compile(r"\bGRANTED\b", re.I)),
-    ("Denied",   re.compile(r"\bDENIED\b",  re.I)),
-    ("Remanded", re.compile(r"\bREMANDED\b", re.I)),
-]
-
-def _extract_outcome_from_snippet(snippet: str) -> Optional[str]:
-    """Extract outcome from a search snippet using OUTCOME_PATTERNS."""
-    found = [label for label, pat in OUTCOME_PATTERNS if pat.search(snippet)]
+# All three outcomes in one alternation, so a decision is scanned once
+# rather than once per outcome word
+OUTCOME_RE  = re.compile(r"\b(GRANTED|DENIED|REMANDED)\b", re.I)
+
+def _outcome_from_text(text: str) -> Optional[str]:
+    """Return Granted/Denied/Remanded, "Mixed" if several appear, or None."""
+    found = set()
+    for m in OUTCOME_RE.finditer(text):
+        found.add(m.group(1).capitalize())
+        if len(found) == 3:
+            break
     if len(found) > 1:
         return "Mixed"
-    return found[0] if found else None
+    return found.pop() if found else None
+
+def _extract_outcome_from_snippet(snippet: str) -> Optional[str]:
+    """Extract outcome from a search snippet using OUTCOME_RE."""
+    return _outcome_from_text(snippet)
 
 # -------------------------------------------------------------------
 # Helpers
 # -------------------------------------------------------------------
+# /vetappYY/ wins over a /YYYY/ segment wherever it appears; the trailing "/"
+# is a lookahead so adjacent segments can both match in one finditer pass
+_YEAR_URL_RE = re.compile(r"/vetapp(\d{2})(?=/)|/(19\d{2}|20\d{2})(?=/)", re.I)
+
 def extract_year_from_url(url: str) -> Optional[int]:
-    m = re.search(r"/vetapp(\d{2})/", url, re.I)
-    if m:
-        yy = int(m.group(1))
-        return 2000 + yy if yy < 50 else 1900 + yy
-    m = re.search(r"/(19\d{2}|20\d{2})/", url)
-    return int(m.group(1)) if m else None
+    year = None
+    for m in _YEAR_URL_RE.finditer(url):
+        if m.group(1):
+            yy = int(m.group(1))
+            return 2000 + yy if yy < 50 else 1900 + yy
+        if year is None:
+            year = int(m.group(2))
+    return year
+
+# Code points deleted from snippets: the highlight markers U+E000/U+E001 and the
+# stray latin-1 bytes of their mis-decoded UTF-8 form (0xEE, 0xDC, 0x80-0xBF)
+_SNIPPET_DELETE = dict.fromkeys([0xEE, 0xDC, 0xE000, 0xE001, *range(0x80, 0xC0)])
 
 def clean_snippet(snippet: str) -> str:
     """Remove search.usa.gov bold-highlight escape chars from snippets."""
-    return re.sub(r"[\xee\x80-\x83\xdc\x80-\xbf]|\uE000|\uE001", "", snippet)
+    return snippet.translate(_SNIPPET_DELETE)
 
 def extract_case_number(url: str) -> Optional[str]:
     if ".txt" in url:
-        return url.split("/")[-1].replace(".txt", "")
+        return url.rpartition("/")[2].replace(".txt", "")
     return None
 
 def parse_decision_text(text: str) -> Dict[str, Any]:
@@ -609,19 +733,19 @@ def parse_decision_text(text: str) -> Dict[str, Any]:
     if m := DOCKET_RE.search(text):
         d["docket_no"] = re.sub(r"\s+", " ", m.group(1)).strip()
 
-    outcomes_found = [label for label, pat in OUTCOME_PATTERNS if pat.search(text)]
-    if len(outcomes_found) > 1:
-        d["outcome"] = "Mixed"
-    elif outcomes_found:
-        d["outcome"] = outcomes_found[0]
+    d["outcome"] = _outcome_from_text(text)
 
     if m := ISSUES_RE.search(text):
         items = re.split(r"\s*\d+\.\s*|;|\n", m.group(1).strip())
         d["issues"] = [i.strip() for i in items if i.strip()][:5]
 
-    cfrs = CFR_RE.findall(text)
-    m21s = M21_RE.findall(text)
-    d["citations"] = sorted(set([f"38 CFR ss {c}" for c in cfrs[:10]] + m21s[:5]))
+    # Only the first 10 CFR / 5 M21 hits are kept, so stop scanning there.
+    # (Not fused into one alternation: an M21 match can run into a following
+    # "38 CFR" and would hide it.)
+    cfrs = [m.group(1) for m in islice(CFR_RE.finditer(text), 10)]
+    m21s = [m.group(0) for m in islice(M21_RE.finditer(text), 5)]
+    # Deduplicate keeping document order (CFR cites first, then M21-1)
+    d["citations"] = list(dict.fromkeys([f"38 CFR ss {c}" for c in cfrs] + m21s))
 
     if m := RO_RE.search(text):
         d["regional_office"] = m.group(1).strip().rstrip(".")
@@ -890,8 +1014,22 @@ def search_case_text(
 
     return all_matches, total, total > max_matches
 
-def _search_json(query: str, year: Optional[int], page: int) -> Dict:
-    """Call search.usa.gov JSON API and return raw response dict."""
+# Upstream response caches. Search results and KnowVA content change slowly and
+# the query space is small and repetitive; the Title 38 TOC changes a few times
+# a year. The sync caches are filled from executor threads, hence the locks.
+_search_cache: TTLCache = TTLCache(maxsize=2048, ttl=600)
+_structure_cache: TTLCache = TTLCache(maxsize=1, ttl=86400)
+_knowva_topics_cache: TTLCache = TTLCache(maxsize=1, ttl=3600)
+_knowva_article_cache: TTLCache = TTLCache(maxsize=1024, ttl=1800)
+_structure_cache_lock = threading.Lock()
+_knowva_cache_lock = threading.Lock()
+
+async def _search_json(query: str, year: Optional[int], page: int) -> Dict:
+    """Call search.usa.gov JSON API and return raw response dict (cached for 10 min)."""
+    key = ("search", query.lower(), year, page)
+    cached_data = _search_cache.get(key)
+    if cached_data is not None:
+        return cached_data
     params: Dict[str, Any] = {
         "affiliate": "bvadecisions",
         "query": query,
@@ -907,14 +1045,14 @@ def _search_json(query: str, year: Optional[int], page: int) -> Dict:
 
     url = f"{SEARCH_BASE}?{urlencode(params)}"
     logger.info(f"GET {url}")
-    session = requests.Session()
-    session.headers.update({"User-Agent": USER_AGENT})
-    resp = session.get(url, timeout=REQUEST_TIMEOUT)
+    resp = await _search_get(url)
     resp.raise_for_status()
-    return resp.json()
+    data = resp.json()
+    _search_cache[key] = data
+    return data
 
-def search_bva(query: str, year: Optional[int], page: int) -> Dict:
-    data = _search_json(query, year, page)
+async def search_bva(query: str, year: Optional[int], page: int) -> Dict:
+    data = await _search_json(query, year, page)
     web = data.get("web", {})
     raw_results = web.get("results", [])
     results = []
@@ -936,16 +1074,29 @@ def search_bva(query: str, year: Optional[int], page: int) -> Dict:
         "results": results,
     }
 
-def fetch_case_text(url: str) -> Dict[str, Any]:
+# Decisions are immutable once published; /case, /case/text, /analyze/text and
+# /search/extract often hit the same URL in one user flow. Bounded by count
+# since a decision is typically 20-100 KB of text.
+_case_text_cache: TTLCache = TTLCache(maxsize=512, ttl=3600)
+_case_text_lock = threading.Lock()
+
+@cached(_case_text_cache, lock=_case_text_lock)
+def _download_case_text(url: str) -> str:
     logger.info(f"Fetching case: {url}")
-    session = requests.Session()
-    session.headers.update({"User-Agent": USER_AGENT})
-    resp = session.get(url, timeout=REQUEST_TIMEOUT)
+    resp = CASE_SESSION.get(url, timeout=REQUEST_TIMEOUT)
     resp.raise_for_status()
-    text = resp.text
+    return resp.text
+
+def _require_case_text(url: str) -> str:
+    """Cached case text, or a 422 if the URL returned nothing usable."""
+    text = _download_case_text(url)
     if not text or len(text) < 100:
         raise BVAAPIError(422, "empty_content", "Invalid or empty case content",
                           field="url", suggested_fix="Verify the URL points to a valid BVA decision .txt file")
+    return text
+
+def fetch_case_text(url: str) -> Dict[str, Any]:
+    text = _require_case_text(url)
     return {
         "url": url,
         "year": extract_year_from_url(url),
@@ -1112,11 +1263,7 @@ def _fetch_and_extract(url: str, title: str, keywords: List[str], proximity: int
                        context_sentences: int, max_passages: int) -> Optional[dict]:
     """Fetch case text and extract keyword passages. Returns dict or None on failure."""
     try:
-        session = requests.Session()
-        session.headers.update({"User-Agent": USER_AGENT})
-        resp = session.get(url, timeout=REQUEST_TIMEOUT)
-        resp.raise_for_status()
-        text = resp.text
+        text = _download_case_text(url)
         if not text or len(text) < 100:
             return None
 
@@ -1148,39 +1295,44 @@ def _fetch_and_extract(url: str, title: str, keywords: List[str], proximity: int
 # -------------------------------------------------------------------
 # Endpoints
 # -------------------------------------------------------------------
+_ROOT_INFO: Dict[str, Any] = {
+    "api": "BVA Decision Search API",
+    "version": "2.0.0",
+    "source": "search.usa.gov JSON API (affiliate: bvadecisions)",
+    "years_available": _YEARS_RANGE_STR,
+    "endpoints": {
+        "GET  /search":                  "Search BVA decisions (query params)",
+        "POST /search":                  "Search BVA decisions (JSON body)",
+        "POST /batch/search":            "Search multiple queries",
+        "POST /search/extract":          "Search + extract keyword passages from cases",
+        "GET  /case":                    "Fetch parsed case details by URL",
+        "GET  /case/text":               "Fetch raw case text by URL",
+        "GET  /analyze/text":            "Analyze decision for keywords & VA terms",
+        "GET  /years":                   "List available year->dc collection mappings",
+        "GET  /knowva/topics":           "List KnowVA knowledge base topics",
+        "GET  /knowva/search?q=":        "Search KnowVA articles (M21-1, policy, etc.)",
+        "GET  /knowva/article/{id}":     "Fetch full KnowVA article by ID",
+        "GET  /knowva/popular":          "List most popular KnowVA articles",
+        "GET  /cfr/structure":              "Title 38 CFR table of contents",
+        "GET  /cfr/section?part=&section=": "Fetch 38 CFR section text as markdown",
+        "GET  /cfr/search?q=":              "Search within Title 38 CFR",
+        "GET  /cfr/dc/{code}":              "Look up a VA diagnostic code",
+        "GET  /cfr/dc/batch?codes=":        "Resolve multiple diagnostic codes in one call",
+        "GET  /cfr/dc?q=":                  "Search diagnostic codes by condition name",
+        "GET  /federal-register/va":     "Recent VA Federal Register documents (rules, notices)",
+        "GET  /federal-register/search?q=": "Search VA Federal Register documents",
+        "GET  /rag/search?q=":           "Semantic search over indexed CFR/KnowVA content",
+        "GET  /rag/status":              "RAG index statistics",
+        "POST /rag/reindex?source=":     "Re-index content into RAG",
+        "POST /case/search":             "Regex search within case text (presets or custom)",
+        "GET  /case/search/presets":     "List available search presets",
+        "GET  /health":                  "Health check",
+    }
+}
+
 @app.get("/")
 async def root():
-    return {
-        "api": "BVA Decision Search API",
-        "version": "2.0.0",
-        "source": "search.usa.gov JSON API (affiliate: bvadecisions)",
-        "years_available": f"{min(YEAR_DC_MAP)} - {max(YEAR_DC_MAP)}",
-        "endpoints": {
-            "GET  /search":                  "Search BVA decisions (query params)",
-            "POST /search":                  "Search BVA decisions (JSON body)",
-            "POST /batch/search":            "Search multiple queries",
-            "POST /search/extract":          "Search + extract keyword passages from cases",
-            "GET  /case":                    "Fetch parsed case details by URL",
-            "GET  /case/text":               "Fetch raw case text by URL",
-            "GET  /analyze/text":            "Analyze decision for keywords & VA terms",
-            "GET  /years":                   "List available year->dc collection mappings",
-            "GET  /knowva/topics":           "List KnowVA knowledge base topics",
-            "GET  /knowva/search?q=":        "Search KnowVA articles (M21-1, policy, etc.)",
-            "GET  /knowva/article/{id}":     "Fetch full KnowVA article by ID",
-            "GET  /knowva/popular":          "List most popular KnowVA articles",
-            "GET  /cfr/structure":              "Title 38 CFR table of contents",
-            "GET  /cfr/section?part=&section=": "Fetch 38 CFR section text as markdown",
-            "GET  /cfr/search?q=":              "Search within Title 38 CFR",
-            "GET  /federal-register/va":     "Recent VA Federal Register documents (rules, notices)",
-            "GET  /federal-register/search?q=": "Search VA Federal Register documents",
-            "GET  /rag/search?q=":           "Semantic search over indexed CFR/KnowVA content",
-            "GET  /rag/status":              "RAG index statistics",
-            "POST /rag/reindex?source=":     "Re-index content into RAG",
-            "POST /case/search":             "Regex search within case text (presets or custom)",
-            "GET  /case/search/presets":     "List available search presets",
-            "GET  /health":                  "Health check",
-        }
-    }
+    return _ROOT_INFO
 
 @app.get("/search", response_model=SearchResponse, tags=["Search"],
     summary="Search BVA decisions by keyword",
@@ -1192,8 +1344,7 @@ async def search_get(
     year: Optional[int] = Query(None, ge=1992, le=2025),
     page: int = Query(1, ge=1, le=50),
 ):
-    loop = asyncio.get_running_loop()
-    data = await loop.run_in_executor(executor, search_bva, q, year, page)
+    data = await search_bva(q, year, page)
     return SearchResponse(
         query=q,
         total=data["total"],
@@ -1206,8 +1357,7 @@ async def search_get(
 
 @app.post("/search", response_model=SearchResponse)
 async def search_post(request: SearchRequest):
-    loop = asyncio.get_running_loop()
-    data = await loop.run_in_executor(executor, search_bva, request.query, request.year, request.page)
+    data = await search_bva(request.query, request.year, request.page)
     return SearchResponse(
         query=request.query,
         total=data["total"],
@@ -1224,22 +1374,25 @@ async def batch_search(payload: BatchSearchPayload = Body(...)):
     if not queries:
         raise BVAAPIError(422, "empty_field", "queries list is empty after trimming whitespace",
                           field="queries", suggested_fix="Provide at least one non-empty query string")
-    loop = asyncio.get_running_loop()
-    results = []
-    for q in queries:
+    # Queries are independent I/O; cap in-flight upstream calls rather than
+    # serializing them.
+    sem = asyncio.Semaphore(BATCH_SEARCH_CONCURRENCY)
+
+    async def _one(q: str) -> BatchSearchResult:
         try:
-            data = await loop.run_in_executor(executor, search_bva, q, payload.year, payload.page)
-            results.append(BatchSearchResult(
+            async with sem:
+                data = await search_bva(q, payload.year, payload.page)
+            return BatchSearchResult(
                 query=q,
                 total=data["total"],
                 count=len(data["results"]),
                 results=data["results"],
-            ))
-            await asyncio.sleep(0.5)
+            )
         except Exception as e:
             logger.error(f"Batch search error for '{q}': {e}")
-            results.append(BatchSearchResult(query=q, total=0, count=0, results=[]))
-    return results
+            return BatchSearchResult(query=q, total=0, count=0, results=[])
+
+    return await asyncio.gather(*(_one(q) for q in queries))
 
 @app.post("/search/extract", response_model=ExtractResponse, tags=["Search"],
     summary="Search + extract keyword passages from BVA decisions",
@@ -1261,19 +1414,25 @@ async def search_extract(req: ExtractRequest = Body(...)):
 
     loop = asyncio.get_running_loop()
 
-    # 1. Collect unique case URLs from search queries
+    # 1. Collect unique case URLs from search queries (fetched concurrently,
+    #    merged in query order so the case list is deterministic)
+    sem = asyncio.Semaphore(BATCH_SEARCH_CONCURRENCY)
+
+    async def _one(q: str) -> Dict:
+        async with sem:
+            return await search_bva(q, req.year, 1)
+
+    searches = await asyncio.gather(*(_one(q) for q in queries), return_exceptions=True)
     seen_urls = set()
     case_items = []  # (url, title)
-    for q in queries:
-        try:
-            data = await loop.run_in_executor(executor, search_bva, q, req.year, 1)
-            for r in data["results"]:
-                if r.url not in seen_urls and len(case_items) < req.max_cases:
-                    seen_urls.add(r.url)
-                    case_items.append((r.url, r.title))
-            await asyncio.sleep(0.5)
-        except Exception as e:
-            logger.error(f"Extract search error for '{q}': {e}")
+    for q, data in zip(queries, searches):
+        if isinstance(data, Exception):
+            logger.error(f"Extract search error for '{q}': {data}")
+            continue
+        for r in data["results"]:
+            if r.url not in seen_urls and len(case_items) < req.max_cases:
+                seen_urls.add(r.url)
+                case_items.append((r.url, r.title))
 
     if not case_items:
         return ExtractResponse(
@@ -1351,18 +1510,41 @@ async def get_case(url: str = Query(...), full_text: bool = Query(False)):
                 "use POST /search/extract or POST /case/search instead. Only use when you need the complete document.",
 )
 async def get_case_text(url: str = Query(...)):
+    # Raw text only: skip parse_decision_text and serve the cached string.
     loop = asyncio.get_running_loop()
-    case_data = await loop.run_in_executor(executor, fetch_case_text, url)
+    text = await loop.run_in_executor(executor, _require_case_text, url)
     return PlainTextResponse(
-        content=case_data["raw_text"],
+        content=text,
         media_type="text/plain",
         headers={
-            "X-Case-Number": case_data.get("case_number") or "unknown",
-            "X-Year": str(case_data.get("year") or "unknown"),
-            "X-Text-Length": str(case_data["text_length"]),
+            "X-Case-Number": extract_case_number(url) or "unknown",
+            "X-Year": str(extract_year_from_url(url) or "unknown"),
+            "X-Text-Length": str(len(text)),
         }
     )
 
+# Terms reported by /analyze/text. None is a substring of another, so a single
+# alternation counts each exactly like a per-term case-insensitive str.count().
+VA_TERMS = (
+    "TDIU", "PTSD", "service-connected", "disability rating", "effective date",
+    "clear and unmistakable error", "individual unemployability",
+)
+_VA_TERM_BY_LOWER = {t.lower(): t for t in VA_TERMS}
+_VA_TERMS_RE = re.compile("|".join(re.escape(t) for t in VA_TERMS), re.IGNORECASE)
+
+# textstat walks the whole decision in pure Python. Decisions are immutable,
+# so cache only the float per case URL rather than keying on (and pinning)
+# the full text.
+_readability_cache: LRUCache = LRUCache(maxsize=1024)
+
+@cached(_readability_cache, key=lambda url, text: url)
+def _readability_grade(url: str, text: str) -> float:
+    return flesch_kincaid_grade(text)
+
+@lru_cache(maxsize=512)
+def _keyword_pattern(keyword: str) -> re.Pattern:
+    return re.compile(re.escape(keyword), re.IGNORECASE)
+
 @app.get("/analyze/text", response_model=AnalyzeResponse)
 async def analyze_text(
     url: str = Query(...),
@@ -1372,13 +1554,11 @@ async def analyze_text(
     loop = asyncio.get_running_loop()
     case_data = await loop.run_in_executor(executor, fetch_case_text, url)
     text = case_data["raw_text"]
-    text_lower = text.lower()
-    text_upper = text.upper()
 
     keyword_counts: Dict[str, int] = {}
     keyword_contexts: Dict[str, List[str]] = {}
     for k in keywords:
-        matches = list(re.finditer(re.escape(k), text, re.IGNORECASE))
+        matches = list(_keyword_pattern(k).finditer(text))
         keyword_counts[k] = len(matches)
         if context:
             keyword_contexts[k] = [
@@ -1386,15 +1566,11 @@ async def analyze_text(
                 for m in matches
             ]
 
-    va_terms = {
-        "TDIU": text_upper.count("TDIU"),
-        "PTSD": text_upper.count("PTSD"),
-        "service-connected": text_lower.count("service-connected"),
-        "disability rating": text_lower.count("disability rating"),
-        "effective date": text_lower.count("effective date"),
-        "clear and unmistakable error": text_lower.count("clear and unmistakable error"),
-        "individual unemployability": text_lower.count("individual unemployability"),
-    }
+    # One case-insensitive pass for all terms instead of an upper()/lower()
+    # copy of the text plus a .count() scan per term
+    va_terms = dict.fromkeys(VA_TERMS, 0)
+    for m in _VA_TERMS_RE.finditer(text):
+        va_terms[_VA_TERM_BY_LOWER[m.group().lower()]] += 1
 
     return AnalyzeResponse(
         url=url,
@@ -1403,7 +1579,7 @@ async def analyze_text(
         keyword_counts=keyword_counts or None,
         keyword_contexts=keyword_contexts if context else None,
         va_terms_found=va_terms,
-        readability_grade=flesch_kincaid_grade(text),
+        readability_grade=_readability_grade(url, text),
         analysis_timestamp=datetime.now().isoformat(),
     )
 
@@ -1511,12 +1687,7 @@ async def case_search(req: CaseSearchRequest):
 
 @app.get("/years")
 async def list_years():
-    return {
-        "years": [
-            {"year": y, "dc": dc}
-            for y, dc in sorted(YEAR_DC_MAP.items())
-        ]
-    }
+    return {"years": _YEARS_SORTED}
 
 @app.get("/health")
 async def health_check():
@@ -1532,13 +1703,14 @@ async def health_check():
 def _knowva_get(path: str, params: Dict[str, Any]) -> Dict:
     url = f"{KNOWVA_BASE}/{path}"
     merged = {**KNOWVA_COMMON, **params}
-    session = requests.Session()
-    session.headers.update(KNOWVA_HEADERS)
     logger.info(f"KnowVA GET {url} params={merged}")
-    resp = session.get(url, params=merged, timeout=REQUEST_TIMEOUT)
+    resp = KNOWVA_SESSION.get(url, params=merged, timeout=REQUEST_TIMEOUT)
     resp.raise_for_status()
-    return resp.json()
+    # Decode the JSON bytes directly (UTF-8 per RFC 8259) rather than through
+    # resp.text, which falls back to charset guessing when no charset is sent
+    return orjson.loads(resp.content)
 
+@cached(_knowva_topics_cache, key=lambda: "topics", lock=_knowva_cache_lock)
 def _knowva_topics_sync() -> List[KnowVATopic]:
     data = _knowva_get("ss/topic", {
         "$attribute": "name,id,parentTopicId,totalArticleCount",
@@ -1580,13 +1752,26 @@ def _knowva_search_sync(query: str, page: int, pagesize: int) -> Dict:
     ]
     return {"total": total, "results": results}
 
-def _clean_html_to_text(html: str) -> str:
-    """Convert HTML to clean markdown text."""
-    # Fix mojibake before parsing (cp1252 bytes misread as latin-1)
-    try:
-        html = html.encode("latin-1").decode("utf-8")
-    except (UnicodeEncodeError, UnicodeDecodeError):
-        pass
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+_MOJIBAKE_RE = re.compile("[\u00c2-\u00f4][\u0080-\u00bf]")
+_NOISE_XPATH = etree.XPath("//script|//style")
+
+def _clean_html_to_text(html: Union[str, LxmlElement]) -> str:
+    """Convert HTML (a string or an already-parsed lxml tree) to clean markdown text."""
+    if isinstance(html, str):
+        # Fix mojibake before parsing (UTF-8 bytes misread as latin-1). The
+        # round-trip can only change text containing a lead/continuation byte
+        # pair, so clean articles skip the extra encode+decode pass.
+        if _MOJIBAKE_RE.search(html):
+            try:
+                html = html.encode("latin-1").decode("utf-8")
+            except (UnicodeEncodeError, UnicodeDecodeError):
+                pass
+    else:
+        # Parsed from bytes with an explicit encoding, so no mojibake repair needed.
+        # html2text drops <head> anyway, so only the body subtree is serialized.
+        body = html.find("body") if html.tag == "html" else None
+        html = lxml.html.tostring(body if body is not None else html, encoding="unicode")
     h = _html2text.HTML2Text()
     h.ignore_links = True
     h.ignore_images = True
@@ -1595,66 +1780,125 @@ def _clean_html_to_text(html: str) -> str:
     h.unicode_snob = True
     text = h.handle(html)
     # Collapse excessive blank lines
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = _BLANK_LINES_RE.sub("\n\n", text)
     return text.strip()
 
-def _ecfr_get(path: str, params: Optional[Dict[str, Any]] = None) -> requests.Response:
-    url = f"{ECFR_VERSIONER_BASE}/{path}"
-    session = requests.Session()
-    session.headers.update(ECFR_HEADERS)
+# Cleaned markdown keyed by a digest of the source HTML. Hashing once is much
+# cheaper than html2text, and unchanged articles/sections hash identically.
+_MARKDOWN_CACHE_MAX = 1024
+_markdown_cache: "OrderedDict[bytes, str]" = OrderedDict()
+_markdown_cache_lock = threading.Lock()
+
+def _cached_markdown(raw: bytes, build: Callable[[], str]) -> str:
+    """Return build() for this HTML payload, reusing the result for identical content."""
+    key = hashlib.blake2b(raw, digest_size=16).digest()
+    with _markdown_cache_lock:
+        text = _markdown_cache.get(key)
+        if text is not None:
+            _markdown_cache.move_to_end(key)
+            return text
+    text = build()
+    with _markdown_cache_lock:
+        _markdown_cache[key] = text
+        if len(_markdown_cache) > _MARKDOWN_CACHE_MAX:
+            _markdown_cache.popitem(last=False)
+    return text
+
+# Last 200 response per eCFR URL, replayed when a conditional GET comes back 304.
+# Regulation text rarely changes, so most revalidations cost a bodiless round-trip.
+_ecfr_validators: LRUCache = LRUCache(maxsize=512)
+_ecfr_validators_lock = threading.Lock()
+
+def _ecfr_request(url: str, params: Optional[Dict[str, Any]] = None,
+                  **kwargs) -> requests.Response:
+    """GET on the pooled eCFR session. Raises for error statuses; 304 is returned as-is."""
     logger.info(f"eCFR GET {url} params={params}")
-    resp = session.get(url, params=params or {}, timeout=REQUEST_TIMEOUT)
-    resp.raise_for_status()
+    resp = ECFR_SESSION.get(url, params=params or {}, timeout=REQUEST_TIMEOUT, **kwargs)
+    if resp.status_code != 304:
+        resp.raise_for_status()
+    return resp
+
+def _ecfr_conditional_get(url: str, params: Optional[Dict[str, Any]] = None,
+                          **kwargs) -> requests.Response:
+    """GET an eCFR resource, revalidating a stored copy with If-None-Match/If-Modified-Since."""
+    params = params or {}
+    key = (url, tuple(sorted(params.items())))
+    with _ecfr_validators_lock:
+        stored = _ecfr_validators.get(key)
+    headers = {}
+    if stored is not None:
+        if stored.headers.get("ETag"):
+            headers["If-None-Match"] = stored.headers["ETag"]
+        if stored.headers.get("Last-Modified"):
+            headers["If-Modified-Since"] = stored.headers["Last-Modified"]
+    resp = _ecfr_request(url, params, headers=headers, **kwargs)
+    if resp.status_code == 304 and stored is not None:
+        logger.info(f"eCFR 304 Not Modified {url}")
+        return stored
+    if "ETag" in resp.headers or "Last-Modified" in resp.headers:
+        with _ecfr_validators_lock:
+            _ecfr_validators[key] = resp
     return resp
 
+def _ecfr_get(path: str, params: Optional[Dict[str, Any]] = None) -> requests.Response:
+    return _ecfr_conditional_get(f"{ECFR_VERSIONER_BASE}/{path}", params)
+
+def _ecfr_part_sections(part_node: Dict) -> List[CFRSection]:
+    sections: List[CFRSection] = []
+    stack = list(reversed(part_node.get("children", [])))
+    while stack:
+        c = stack.pop()
+        if c.get("type") == "section":
+            sections.append(CFRSection(
+                identifier=c.get("identifier", ""),
+                label=c.get("label_level", c.get("identifier", "")),
+            ))
+        else:
+            stack.extend(reversed(c.get("children", [])))
+    return sections
+
+@cached(_structure_cache, key=lambda: "title-38", lock=_structure_cache_lock)
 def _ecfr_structure_sync() -> CFRStructureResponse:
     resp = _ecfr_get("structure/current/title-38.json")
     data = resp.json()
     parts: List[CFRPart] = []
-
-    def _collect(node: Dict) -> None:
+    # Iterative pre-order walk (children pushed reversed so order matches the
+    # TOC); stops descending at each part and collects its sections.
+    stack = list(reversed(data.get("children", [])))
+    while stack:
+        node = stack.pop()
         if node.get("type") == "part":
-            sections = []
-            def _secs(n):
-                for c in n.get("children", []):
-                    if c.get("type") == "section":
-                        sections.append(CFRSection(
-                            identifier=c.get("identifier", ""),
-                            label=c.get("label_level", c.get("identifier", "")),
-                        ))
-                    else:
-                        _secs(c)
-            _secs(node)
             parts.append(CFRPart(
                 number=node.get("identifier", ""),
                 label=node.get("label_level", ""),
-                sections=sections,
+                sections=_ecfr_part_sections(node),
             ))
         else:
-            for child in node.get("children", []):
-                _collect(child)
-
-    for child in data.get("children", []):
-        _collect(child)
+            stack.extend(reversed(node.get("children", [])))
 
     return CFRStructureResponse(
         title=38, date=data.get("date", "current"),
         parts=parts, retrieved_at=datetime.now().isoformat()
     )
 
+def _ecfr_section_markdown(resp: requests.Response) -> str:
+    # Parse the raw bytes directly -- skips building resp.text and a str(soup)
+    # round-trip, which doubled peak memory on large sections.
+    # requests assumes ISO-8859-1 for text/* without a charset; eCFR serves UTF-8.
+    declared = "charset" in resp.headers.get("Content-Type", "").lower()
+    parser = lxml.html.HTMLParser(encoding=resp.encoding if declared else "utf-8")
+    tree = lxml.html.document_fromstring(resp.content, parser=parser)
+    # Remove metadata noise
+    for tag in _NOISE_XPATH(tree):
+        tag.drop_tree()
+    return _clean_html_to_text(tree)
+
 def _ecfr_section_sync(part: str, section: str) -> CFRSectionResponse:
     # Renderer API returns enhanced HTML with redirects; section param needs full "part.section" form
     url = "https://www.ecfr.gov/api/renderer/v1/content/enhanced/current/title-38"
-    session = requests.Session()
-    session.headers.update(ECFR_HEADERS)
-    resp = session.get(url, params={"part": part, "section": f"{part}.{section}"},
-                       timeout=REQUEST_TIMEOUT, allow_redirects=True)
-    resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, "html.parser")
-    # Remove metadata noise
-    for tag in soup.find_all(["script", "style"]):
-        tag.decompose()
-    markdown = _clean_html_to_text(str(soup))
+    resp = _ecfr_conditional_get(url, {"part": part, "section": f"{part}.{section}"},
+                                 allow_redirects=True)
+    markdown = _cached_markdown(resp.content, lambda: _ecfr_section_markdown(resp))
     return CFRSectionResponse(
         part=part, section=section,
         citation=f"38 CFR \u00a7 {part}.{section}",
@@ -1665,18 +1909,14 @@ def _ecfr_section_sync(part: str, section: str) -> CFRSectionResponse:
 def _ecfr_search_sync(query: str, page: int, per_page: int,
                       part: Optional[str] = None) -> Dict:
     """Search eCFR, filter to Title 38, deduplicate by section, strip HTML."""
-    session = requests.Session()
-    session.headers.update(ECFR_HEADERS)
     results = []
     seen_sections = set()
     api_page = 1
     max_api_pages = 10
 
     while len(results) < per_page and api_page <= max_api_pages:
-        resp = session.get(ECFR_SEARCH_BASE,
-                           params={"query": query, "per_page": 100, "page": api_page},
-                           timeout=REQUEST_TIMEOUT)
-        resp.raise_for_status()
+        resp = _ecfr_request(ECFR_SEARCH_BASE,
+                             {"query": query, "per_page": 100, "page": api_page})
         data = resp.json()
         raw = data.get("results", [])
         if not raw:
@@ -1721,32 +1961,37 @@ def _ecfr_search_sync(query: str, page: int, per_page: int,
     paged = results[start:start + per_page]
     return {"total": len(results), "results": paged}
 
+# FR fields copied through unchanged (all Optional[str] on FederalRegisterDocument)
+_FR_OPTIONAL_FIELDS = ("abstract", "citation", "pdf_url", "action", "dates",
+                       "effective_on", "comments_close_on")
+
 def _fr_parse_doc(doc: dict) -> FederalRegisterDocument:
-    """Parse a Federal Register API document into our model."""
-    agencies = [a.get("name", "") for a in doc.get("agencies", []) if a.get("name")]
+    """Parse a Federal Register API document into our model.
+
+    Uses model_construct: FastAPI validates the response model on the way out,
+    so validating each document here as well was a redundant second pass.
+    Required string fields are coerced so a null upstream value can't slip through.
+    """
+    get = doc.get
+    agencies = [a["name"] for a in get("agencies") or () if a.get("name")]
     cfr_refs = []
-    for ref in doc.get("cfr_references", []) or []:
+    for ref in get("cfr_references") or ():
         title = ref.get("title")
-        parts = ref.get("parts", [])
+        parts = ref.get("parts") or ()
         for p in parts:
             cfr_refs.append(f"{title} CFR Part {p.get('part', '?')}")
         if not parts and title:
             cfr_refs.append(f"{title} CFR")
-    return FederalRegisterDocument(
-        document_number=doc.get("document_number", ""),
-        title=doc.get("title", ""),
-        type=doc.get("type", ""),
-        abstract=doc.get("abstract"),
-        citation=doc.get("citation"),
-        publication_date=doc.get("publication_date", ""),
+    fields = {f: get(f) for f in _FR_OPTIONAL_FIELDS}
+    return FederalRegisterDocument.model_construct(
+        document_number=get("document_number") or "",
+        title=get("title") or "",
+        type=get("type") or "",
+        publication_date=get("publication_date") or "",
         agencies=agencies,
-        html_url=doc.get("html_url", ""),
-        pdf_url=doc.get("pdf_url"),
+        html_url=get("html_url") or "",
         cfr_references=cfr_refs or None,
-        action=doc.get("action"),
-        dates=doc.get("dates"),
-        effective_on=doc.get("effective_on"),
-        comments_close_on=doc.get("comments_close_on"),
+        **fields,
     )
 
 def _fr_va_documents_sync(
@@ -1755,18 +2000,11 @@ def _fr_va_documents_sync(
     per_page: int = 20,
 ) -> Dict:
     """Fetch recent VA documents from the Federal Register."""
-    params = {
-        "conditions[agencies][]": FR_VA_SLUG,
-        "fields[]": FR_FIELDS,
-        "per_page": per_page,
-        "page": page,
-        "order": "newest",
-    }
+    params = list(_FR_BASE_PARAMS)
+    params += [("per_page", per_page), ("page", page), ("order", "newest")]
     if doc_type:
-        params["conditions[type][]"] = doc_type
-    session = requests.Session()
-    session.headers.update({"User-Agent": USER_AGENT})
-    resp = session.get(f"{FR_API_BASE}/documents.json", params=params, timeout=REQUEST_TIMEOUT)
+        params.append(("conditions[type][]", doc_type))
+    resp = FR_SESSION.get(f"{FR_API_BASE}/documents.json", params=params, timeout=REQUEST_TIMEOUT)
     resp.raise_for_status()
     data = resp.json()
     results = [_fr_parse_doc(d) for d in data.get("results", [])]
@@ -1781,27 +2019,20 @@ def _fr_search_sync(
     per_page: int = 20,
 ) -> Dict:
     """Search VA documents in the Federal Register."""
-    params = {
-        "conditions[agencies][]": FR_VA_SLUG,
-        "conditions[term]": query,
-        "fields[]": FR_FIELDS,
-        "per_page": per_page,
-        "page": page,
-        "order": "relevance",
-    }
+    params = list(_FR_BASE_PARAMS)
+    params += [("conditions[term]", query), ("per_page", per_page),
+               ("page", page), ("order", "relevance")]
     if doc_type:
-        params["conditions[type][]"] = doc_type
+        params.append(("conditions[type][]", doc_type))
     if cfr_title and cfr_part:
-        params["conditions[cfr][title]"] = cfr_title
-        params["conditions[cfr][part]"] = cfr_part
-    session = requests.Session()
-    session.headers.update({"User-Agent": USER_AGENT})
-    resp = session.get(f"{FR_API_BASE}/documents.json", params=params, timeout=REQUEST_TIMEOUT)
+        params += [("conditions[cfr][title]", cfr_title), ("conditions[cfr][part]", cfr_part)]
+    resp = FR_SESSION.get(f"{FR_API_BASE}/documents.json", params=params, timeout=REQUEST_TIMEOUT)
     resp.raise_for_status()
     data = resp.json()
     results = [_fr_parse_doc(d) for d in data.get("results", [])]
     return {"total": data.get("count", 0), "results": results}
 
+@cached(_knowva_article_cache, lock=_knowva_cache_lock)
 def _knowva_article_sync(article_id: int) -> KnowVAArticle:
     data = _knowva_get(f"ss/article/{article_id}", {
         "$attribute": "name,id,lastModifiedDate,content",
@@ -1814,7 +2045,8 @@ def _knowva_article_sync(article_id: int) -> KnowVAArticle:
         id=a.get("id", article_id),
         name=a.get("name", ""),
         last_modified_date=a.get("lastModifiedDate"),
-        content=_clean_html_to_text(html) if html else None,
+        content=_cached_markdown(html.encode("utf-8", "surrogatepass"),
+                                 lambda: _clean_html_to_text(html)) if html else None,
     )
 
 def _knowva_popular_sync(pagesize: int) -> List[KnowVAArticleSummary]:
@@ -1888,12 +2120,25 @@ async def knowva_popular(pagesize: int = Query(10, ge=1, le=50)):
 # -------------------------------------------------------------------
 # 38 CFR endpoints
 # -------------------------------------------------------------------
+# Serialized TOC bytes plus a content ETag, so repeat hits skip response-model
+# validation and re-encoding of several thousand sections, and clients holding
+# the current copy get a 304 instead of the body
+_structure_json_cache: TTLCache = TTLCache(maxsize=1, ttl=86400)
+
+@cached(_structure_json_cache, key=lambda: "title-38", lock=_structure_cache_lock)
+def _ecfr_structure_json() -> Tuple[bytes, str]:
+    body = orjson.dumps(_ecfr_structure_sync().model_dump())
+    return body, f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
 @app.get("/cfr/structure", response_model=CFRStructureResponse, tags=["38 CFR"])
-async def cfr_structure():
+async def cfr_structure(request: Request):
     """Title 38 CFR table of contents - all parts and sections."""
     loop = asyncio.get_running_loop()
     try:
-        return await loop.run_in_executor(executor, _ecfr_structure_sync)
+        body, etag = await loop.run_in_executor(executor, _ecfr_structure_json)
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        return Response(content=body, media_type="application/json", headers={"ETag": etag})
     except Exception as e:
         logger.error(f"eCFR structure error: {e}")
         raise BVAAPIError(502, "upstream_error", str(e),
@@ -1941,6 +2186,16 @@ def _dc_to_model(dc: str, info: Dict[str, str]) -> DiagnosticCode:
         part=info["part"], section=info["section"], schedule=info["schedule"],
     )
 
+@app.get("/cfr/dc/batch", response_model=DiagnosticCodeBatchResponse, tags=["38 CFR"])
+async def cfr_diagnostic_code_batch(
+    codes: List[str] = Query(..., description="Diagnostic codes to resolve, e.g. codes=9411&codes=6260"),
+):
+    """Resolve several diagnostic codes in one call. Unknown codes are listed in not_found."""
+    return DiagnosticCodeBatchResponse(
+        results=[_dc_to_model(c, DC_LOOKUP[c]) for c in codes if c in DC_LOOKUP],
+        not_found=[c for c in codes if c not in DC_LOOKUP],
+    )
+
 @app.get("/cfr/dc/{code}", response_model=DiagnosticCode, tags=["38 CFR"])
 async def cfr_diagnostic_code(code: str):
     """Look up a VA diagnostic code (e.g. 9411 for PTSD). Returns CFR citation and schedule."""
@@ -1971,7 +2226,7 @@ async def cfr_diagnostic_search(
     if not matched_dcs:
         raise BVAAPIError(404, "not_found", f"No diagnostic codes matching '{q}'",
                           field="q", suggested_fix="Try broader terms like 'knee', 'back', 'anxiety'. Use bva_cfr_dc_lookup if you know the DC number")
-    results = [_dc_to_model(dc, DC_LOOKUP[dc]) for dc in sorted(matched_dcs)]
+    results = [_dc_to_model(dc, DC_LOOKUP[dc]) for dc in sorted(matched_dcs, key=_DC_SORT_KEY.__getitem__)]
     return results
 
 # -------------------------------------------------------------------
@@ -2024,7 +2279,6 @@ async def fr_search(
 # RAG endpoints
 # -------------------------------------------------------------------
 import rag as _rag
-from chunker import Chunk
 
 class RAGSearchResponse(BaseModel):
     query: str
@@ -2054,16 +2308,15 @@ async def rag_search(
 ):
     """Semantic search over indexed CFR sections and KnowVA articles."""
     try:
-        results = _rag.search(
+        results, total = _rag.search_with_total(
             query=q, top_k=top_k,
             content_type=content_type, part=part,
             schedule=schedule, source=source,
         )
-        stats = _rag.get_stats()
         return RAGSearchResponse(
             query=q, top_k=top_k,
             results=results,
-            total_indexed=stats["total_chunks"],
+            total_indexed=total,
         )
     except Exception as e:
         logger.error(f"RAG search error: {e}")
@@ -2071,17 +2324,26 @@ async def rag_search(
                           suggested_fix="Internal error. Retry or try a different query")
 
 @app.get("/rag/status", response_model=RAGStatusResponse, tags=["RAG"])
-async def rag_status():
+async def rag_status(request: Request, response: Response):
     """Return RAG index statistics."""
     try:
         stats = _rag.get_stats()
-        return RAGStatusResponse(
+        status = RAGStatusResponse(
             total_chunks=stats["total_chunks"],
             collection=stats["collection"],
             embedding_model=stats["embedding_model"],
             by_source=stats.get("by_source", {}),
             by_content_type=stats.get("by_content_type", {}),
         )
+        # Validator derived from the content, so pollers get 304s until the
+        # index actually changes rather than whenever the stats cache expires.
+        digest = hashlib.blake2b(orjson.dumps(status.model_dump(), option=orjson.OPT_SORT_KEYS),
+                                 digest_size=16).hexdigest()
+        etag = f'W/"{digest}"'
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        return status
     except Exception as e:
         logger.error(f"RAG status error: {e}")
         raise BVAAPIError(500, "internal_error", str(e),
@@ -2092,17 +2354,12 @@ async def rag_reindex(
     source: str = Query("all", description="Source to reindex: cfr, knowva, all"),
 ):
     """Trigger re-indexing of content into the RAG index."""
-    from ingest import ingest_cfr_part3, ingest_cfr_part4, ingest_knowva
+    from ingest import index_sources
     api_url = os.environ.get("BVA_API_URL", "http://localhost:8001")
     loop = asyncio.get_running_loop()
     try:
-        all_chunks: List[Chunk] = []
-        if source in ("cfr", "all"):
-            all_chunks.extend(await loop.run_in_executor(executor, ingest_cfr_part4, api_url))
-            all_chunks.extend(await loop.run_in_executor(executor, ingest_cfr_part3, api_url))
-        if source in ("knowva", "all"):
-            all_chunks.extend(await loop.run_in_executor(executor, ingest_knowva, api_url))
-        indexed = _rag.add_chunks(all_chunks)
+        indexed = await loop.run_in_executor(
+            executor, lambda: index_sources(api_url, source, stop=_shutdown_flag))
         stats = _rag.get_stats()
         return {
             "status": "ok",
@@ -2242,6 +2499,43 @@ async def cavc_find_entry(
                           field="keyword", suggested_fix="Try broader terms like 'brief', 'motion', 'order', 'mandate', or 'remand'")
     return _dc_to_dict(entry)
 
+_warm_task: Optional[asyncio.Task] = None
+
+@app.on_event("startup")
+async def _warm_upstreams():
+    """Resolve DNS and open pooled connections to each upstream, then prefetch the CFR TOC.
+
+    Runs in the background so a freshly scaled instance's first users don't pay
+    the DNS + TCP + TLS setup inline. Disable with WARM_UPSTREAMS=0.
+    """
+    global _warm_task
+    if os.environ.get("WARM_UPSTREAMS", "1") == "0":
+        return
+
+    async def _warm():
+        loop = asyncio.get_running_loop()
+        try:
+            await _get_search_client().head(SEARCH_BASE, timeout=5)
+        except Exception as e:
+            logger.info(f"Warm-up of {SEARCH_BASE} failed: {e}")
+        for session, url in (
+            (KNOWVA_SESSION, f"{KNOWVA_BASE}/ss/topic"),
+            (ECFR_SESSION, ECFR_VERSIONER_BASE),
+            (FR_SESSION, FR_API_BASE),
+        ):
+            try:
+                await loop.run_in_executor(
+                    executor, lambda s=session, u=url: s.head(u, timeout=5))
+            except Exception as e:
+                logger.info(f"Warm-up of {url} failed: {e}")
+        try:
+            await loop.run_in_executor(executor, _ecfr_structure_json)
+            logger.info("CFR structure cache warmed")
+        except Exception as e:
+            logger.info(f"CFR structure prefetch failed: {e}")
+
+    _warm_task = asyncio.create_task(_warm())
+
 @app.on_event("shutdown")
 async def _shutdown_event():
     # Cloud Run sends SIGTERM during rollout / scale-down. Let uvicorn handle
@@ -2249,8 +2543,25 @@ async def _shutdown_event():
     # Replaced a bare signal handler that called sys.exit(0) — which bypassed
     # FastAPI's graceful shutdown and caused "no available instance" 429s
     # when instances were terminated before replacement capacity was ready.
+    # Nothing here blocks the loop: a running reindex is told to stop between
+    # batches, queued executor work is cancelled, and calls already in flight
+    # are left to finish on their own threads (closing the sessions below
+    # drops their connections once returned to the pool).
+    _shutdown_flag.set()
+    for task in (_reindex_task, _warm_task):
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
     logger.info("Shutting down executor...")
     executor.shutdown(wait=False, cancel_futures=True)
+    cavc_client.close()
+    if _search_client is not None:
+        await _search_client.aclose()
+    for session in (CASE_SESSION, KNOWVA_SESSION, ECFR_SESSION, FR_SESSION):
+        session.close()
 
 # --- Static site serving (must be AFTER all API routes) ---
 STATIC_DIR = os.path.join(os.path.dirname(__file__), "static")
@@ -2340,4 +2651,5 @@ if __name__ == "__main__":
     if port != PORT:
         logger.warning(f"Port {PORT} in use, using {port} instead")
 
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    uvicorn.run(app, host="0.0.0.0", port=port,
+                timeout_graceful_shutdown=int(os.environ.get("UVICORN_GRACEFUL_TIMEOUT", 8)))
@@ -263,6 +263,10 @@ class CavcClient:
     def __init__(self) -> None:
         self._session = _make_session()
 
+    def close(self) -> None:
+        """Close the underlying HTTP session and its connection pool."""
+        self._session.close()
+
     def _post_form(self, data: dict[str, str]) -> str | None:
         try:
             r = self._session.post(CAVC_BASE, data=data, timeout=TIMEOUT)
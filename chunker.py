@@ -2,12 +2,37 @@
 """Chunking logic for CFR Part 3, Part 4, and KnowVA content."""
 
 import hashlib
+import os
 import re
+import sys
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
+# Boundary patterns, compiled once at import. Each captures everything it
+# consumes except a leading newline, so re.split() yields the pieces needed to
+# rebuild each chunk: [prefix, <group>, body, <group>, body, ...].
+# Boundaries are anchored on a literal "\n" (no "^" alternation) so the engine
+# can skip ahead to newlines; callers split "\n" + text so a boundary at the
+# very start still matches.
+_DC_RE = re.compile(r"\n(\d{4})(?=\s)")                        # 4-digit diagnostic codes
+_SUBSECTION_RE = re.compile(r"\n(\([a-z]\)\s)")               # (a), (b), ... subsections
+_SUBLETTER_RE = re.compile(r"\(([a-z])\)")
+_HEADING_RE = re.compile(r"\n(#{2,3}\s+.+)")                    # ## / ### markdown headings
+_NON_SPACE_RE = re.compile(r"\S")
+# Two DC boundaries need at least "dddd\ndddd " = 10 chars; anything shorter
+# can only take the whole-section path, so skip the regex scan.
+_MIN_DC_SPLIT_LEN = 10
 
-@dataclass
+
+class DcInfo(NamedTuple):
+    """Diagnostic code entry: condition name and where its criteria live in 38 CFR."""
+    condition: str
+    section: str
+    part: str
+    schedule: str
+
+
+@dataclass(slots=True)
 class Chunk:
     id: str
     text: str
@@ -15,78 +40,123 @@ class Chunk:
     source_url: Optional[str] = None
 
 
+# Chunk IDs are the upsert keys of the persisted Chroma collection, so the
+# default stays sha256 (IDs unchanged). "blake2b" yields a full 8-byte digest
+# instead of a truncated one; switching requires a clear + reindex.
+CHUNK_ID_HASH = os.environ.get("CHUNK_ID_HASH", "sha256")
+
+
+def _new_hasher():
+    return hashlib.blake2b(digest_size=8) if CHUNK_ID_HASH == "blake2b" else hashlib.sha256()
+
+
 def _make_id(*parts: str) -> str:
     """Deterministic chunk ID for idempotent upsert."""
-    raw = ":".join(str(p) for p in parts)
-    return hashlib.sha256(raw.encode()).hexdigest()[:16]
+    h = _new_hasher()
+    # Same bytes as ":".join(parts), fed incrementally without the joined string
+    for i, p in enumerate(parts):
+        if i:
+            h.update(b":")
+        h.update(str(p).encode())
+    return h.hexdigest()[:16]
+
+
+def _id_prefix(*parts: str):
+    """Hasher pre-fed with "part:part:...:" for IDs sharing a common prefix."""
+    h = _new_hasher()
+    for p in parts:
+        h.update(str(p).encode())
+        h.update(b":")
+    return h
+
+
+def _make_id_from(prefix, last: str) -> str:
+    """Same as _make_id(*prefix_parts, last), reusing the prefix hash state."""
+    h = prefix.copy()
+    h.update(last.encode())
+    return h.hexdigest()[:16]
+
+
+def _clip(text: str, limit: int) -> str:
+    """Same result as text.strip()[:limit], but a long text is only copied once.
+
+    Short texts take the plain strip(); for long ones only the kept window is
+    sliced out, rather than stripping the whole string and then slicing it again.
+    """
+    if len(text) <= limit:
+        return text.strip()
+    m = _NON_SPACE_RE.search(text)
+    if m is None:
+        return ""
+    start = m.start()
+    window = text[start:start + limit]
+    # Anything non-blank past the window means strip() would not reach into it
+    if _NON_SPACE_RE.search(text, start + limit):
+        return window
+    return window.rstrip()
 
 
 def chunk_cfr_part4(
     section_markdown: str,
     part: str,
     section: str,
-    dc_lookup: Dict[str, Dict[str, str]],
+    dc_lookup: Dict[str, DcInfo],
 ) -> List[Chunk]:
     """Chunk a Part 4 rating criteria section by diagnostic code boundaries."""
     if not section_markdown or not section_markdown.strip():
         return []
 
-    # Find DCs that map to this section
-    section_dcs = {
-        dc: info for dc, info in dc_lookup.items()
-        if info["part"] == part and info["section"] == section
-    }
-
     # Try to split on DC code patterns (4-digit codes like 9411, 6847)
-    dc_pattern = re.compile(r"(?:^|\n)(\d{4})\s", re.MULTILINE)
-    splits = list(dc_pattern.finditer(section_markdown))
+    if len(section_markdown) >= _MIN_DC_SPLIT_LEN:
+        pieces = _DC_RE.split("\n" + section_markdown)
+    else:
+        pieces = [section_markdown]
+
+    # Shared per-section values; each chunk gets its own shallow copy of the metadata.
+    # part/section may come from parsed API/CLI input, so intern them to share
+    # one object with the DC lookup and other sections' chunks.
+    part, section = sys.intern(part), sys.intern(section)
+    meta_template = {
+        "source": "cfr",
+        "part": part,
+        "section": section,
+        "content_type": "rating_criteria",
+    }
+    source_url = f"https://www.ecfr.gov/current/title-38/part-{part}/section-{part}.{section}"
 
     chunks = []
-    if len(splits) >= 2:
+    if len(pieces) >= 5:  # at least two DC boundaries
+        id_prefix = _id_prefix("cfr", part, section)
         # Split at each DC boundary
-        for i, match in enumerate(splits):
-            start = match.start()
-            end = splits[i + 1].start() if i + 1 < len(splits) else len(section_markdown)
-            dc_code = match.group(1)
-            text = section_markdown[start:end].strip()
+        for dc_code, body in zip(pieces[1::2], pieces[2::2]):
+            text = _clip(dc_code + body, 3000)
             if len(text) < 20:
                 continue
-            dc_info = section_dcs.get(dc_code, {})
-            meta = {
-                "source": "cfr",
-                "part": part,
-                "section": section,
-                "content_type": "rating_criteria",
-            }
-            if dc_code in dc_lookup:
+            meta = meta_template.copy()
+            info = dc_lookup.get(dc_code)
+            if info is not None:
                 meta["dc"] = dc_code
-                meta["condition"] = dc_lookup[dc_code].get("condition", "")
-                meta["schedule"] = dc_lookup[dc_code].get("schedule", "")
+                meta["condition"] = info.condition
+                meta["schedule"] = info.schedule
             chunks.append(Chunk(
-                id=_make_id("cfr", part, section, dc_code),
-                text=text[:3000],
+                id=_make_id_from(id_prefix, dc_code),
+                text=text,
                 metadata=meta,
-                source_url=f"https://www.ecfr.gov/current/title-38/part-{part}/section-{part}.{section}",
+                source_url=source_url,
             ))
     else:
         # Keep whole section as one chunk
-        schedule = ""
-        for info in section_dcs.values():
-            schedule = info.get("schedule", "")
-            break
-        meta = {
-            "source": "cfr",
-            "part": part,
-            "section": section,
-            "content_type": "rating_criteria",
-        }
+        # Schedule of the first DC mapped to this section; stops at the first hit
+        schedule = next((info.schedule for info in dc_lookup.values()
+                         if info.section == section and info.part == part), "")
+        meta = meta_template.copy()
         if schedule:
             meta["schedule"] = schedule
         chunks.append(Chunk(
             id=_make_id("cfr", part, section, "full"),
             text=section_markdown[:4000].strip(),
             metadata=meta,
-            source_url=f"https://www.ecfr.gov/current/title-38/part-{part}/section-{part}.{section}",
+            source_url=source_url,
         ))
 
     return chunks
@@ -101,58 +171,94 @@ def chunk_cfr_part3(
     if not section_markdown or not section_markdown.strip():
         return []
 
-    # Split on subsection markers like (a), (b), (c)
-    subsection_pattern = re.compile(r"\n\([a-z]\)\s")
-    splits = list(subsection_pattern.finditer(section_markdown))
+    # Split on subsection markers like (a), (b), (c); a plain substring
+    # check rules out stub sections without running the regex
+    if "\n(" in section_markdown:
+        pieces = _SUBSECTION_RE.split(section_markdown)
+    else:
+        pieces = [section_markdown]
+    n_splits = len(pieces) // 2
 
     # Extract header (everything before first subsection)
     header = ""
-    if splits:
-        header = section_markdown[:splits[0].start()].strip()
+    if n_splits:
+        header = pieces[0].strip()
         if len(header) > 500:
             header = header[:500]
 
+    part, section = sys.intern(part), sys.intern(section)
+    meta_template = {
+        "source": "cfr",
+        "part": part,
+        "section": section,
+        "content_type": "adjudication",
+    }
+    source_url = f"https://www.ecfr.gov/current/title-38/part-{part}/section-{part}.{section}"
+
     chunks = []
-    if len(splits) >= 2:
-        for i, match in enumerate(splits):
-            start = match.start()
-            end = splits[i + 1].start() if i + 1 < len(splits) else len(section_markdown)
-            text = section_markdown[start:end].strip()
+    if n_splits >= 2:
+        id_prefix = _id_prefix("cfr", part, section)
+        for i, (marker, body) in enumerate(zip(pieces[1::2], pieces[2::2])):
+            text = _clip(marker + body, 3000)
             # Merge short subsections with context
-            if len(text) < 100 and i + 1 < len(splits):
+            if len(text) < 100 and i + 1 < n_splits:
                 continue
             # Prepend section header for context
             full_text = f"38 CFR {part}.{section}\n{header}\n\n{text}" if header else text
-            subsection_letter = re.search(r"\(([a-z])\)", text)
+            subsection_letter = _SUBLETTER_RE.search(text)
             sub_id = subsection_letter.group(1) if subsection_letter else str(i)
             chunks.append(Chunk(
-                id=_make_id("cfr", part, section, sub_id),
+                id=_make_id_from(id_prefix, sub_id),
                 text=full_text[:3000],
-                metadata={
-                    "source": "cfr",
-                    "part": part,
-                    "section": section,
-                    "content_type": "adjudication",
-                },
-                source_url=f"https://www.ecfr.gov/current/title-38/part-{part}/section-{part}.{section}",
+                metadata=meta_template.copy(),
+                source_url=source_url,
             ))
     else:
         # No subsection splits found - keep whole section
         chunks.append(Chunk(
             id=_make_id("cfr", part, section, "full"),
             text=section_markdown[:4000].strip(),
-            metadata={
-                "source": "cfr",
-                "part": part,
-                "section": section,
-                "content_type": "adjudication",
-            },
-            source_url=f"https://www.ecfr.gov/current/title-38/part-{part}/section-{part}.{section}",
+            metadata=meta_template.copy(),
+            source_url=source_url,
         ))
 
     return chunks
 
 
+def _rollover_paragraphs(full_text: str, title_prefix: str) -> Tuple[List[str], Optional[str]]:
+    """Pack paragraphs into ~3000-char pieces, re-prefixing the title on each rollover.
+
+    Returns the stripped rolled-over pieces and the stripped remainder (None if
+    it holds nothing beyond the title prefix).
+    """
+    tp_len = len(title_prefix)
+    rolled: List[str] = []
+    # Walk "\n\n" separators by index; the current piece is always
+    # prefix + full_text[start:<end of last paragraph>], so text is only
+    # sliced out when a piece is emitted.
+    prefix = ""
+    start = 0
+    current_len = 0
+    pos = 0
+    while True:
+        sep = full_text.find("\n\n", pos)
+        para_len = (len(full_text) if sep == -1 else sep) - pos
+        if current_len + para_len > 3000 and current_len:
+            rolled.append((prefix + full_text[start:pos - 2]).strip())
+            prefix = title_prefix
+            start = pos
+            current_len = tp_len + para_len + 2
+        else:
+            current_len += para_len + 2
+        if sep == -1:
+            break
+        pos = sep + 2
+    tail = (prefix + full_text[start:]).strip()
+    if len(tail) > tp_len:
+        return rolled, tail
+    return rolled, None
+
+
 def chunk_knowva(
     article_markdown: str,
     article_id: int,
@@ -162,33 +268,33 @@ def chunk_knowva(
     if not article_markdown or not article_markdown.strip():
         return []
 
-    # Split on markdown headings (## or ###)
-    heading_pattern = re.compile(r"(?:^|\n)(#{2,3}\s+.+)")
-    splits = list(heading_pattern.finditer(article_markdown))
+    # Split on markdown headings (## or ###); skip the scan when there are none
+    if "##" in article_markdown:
+        pieces = _HEADING_RE.split("\n" + article_markdown)
+    else:
+        pieces = [article_markdown]
 
     chunks = []
     title_prefix = f"# {article_name}\n\n"
+    meta_template = {
+        "source": "knowva",
+        "article_id": str(article_id),
+        "article_name": article_name,
+        "content_type": "guidance",
+    }
 
-    if len(splits) >= 2:
+    if len(pieces) >= 5:  # at least two headings
         # Add intro section (before first heading)
-        intro_end = splits[0].start()
-        intro = article_markdown[:intro_end].strip()
+        intro = pieces[0].strip()
         if len(intro) > 50:
             chunks.append(Chunk(
                 id=_make_id("knowva", str(article_id), "intro"),
                 text=(title_prefix + intro)[:3000],
-                metadata={
-                    "source": "knowva",
-                    "article_id": str(article_id),
-                    "article_name": article_name,
-                    "content_type": "guidance",
-                },
+                metadata=meta_template.copy(),
             ))
 
-        for i, match in enumerate(splits):
-            start = match.start()
-            end = splits[i + 1].start() if i + 1 < len(splits) else len(article_markdown)
-            text = article_markdown[start:end].strip()
+        for i, (heading, body) in enumerate(zip(pieces[1::2], pieces[2::2])):
+            text = (heading + body).strip()
             if len(text) < 50:
                 continue
             # Prepend article title for context
@@ -196,46 +302,24 @@ def chunk_knowva(
             # Split further if too long (~800 tokens ~ 3200 chars)
             if len(full_text) > 3200:
                 # Split on paragraph boundaries
-                paragraphs = full_text.split("\n\n")
-                current = ""
-                sub_idx = 0
-                for para in paragraphs:
-                    if len(current) + len(para) > 3000 and current:
-                        chunks.append(Chunk(
-                            id=_make_id("knowva", str(article_id), str(i), str(sub_idx)),
-                            text=current.strip(),
-                            metadata={
-                                "source": "knowva",
-                                "article_id": str(article_id),
-                                "article_name": article_name,
-                                "content_type": "guidance",
-                            },
-                        ))
-                        current = title_prefix + para + "\n\n"
-                        sub_idx += 1
-                    else:
-                        current += para + "\n\n"
-                if current.strip() and len(current.strip()) > len(title_prefix):
+                rolled, tail = _rollover_paragraphs(full_text, title_prefix)
+                for sub_idx, text in enumerate(rolled):
                     chunks.append(Chunk(
                         id=_make_id("knowva", str(article_id), str(i), str(sub_idx)),
-                        text=current.strip()[:3000],
-                        metadata={
-                            "source": "knowva",
-                            "article_id": str(article_id),
-                            "article_name": article_name,
-                            "content_type": "guidance",
-                        },
+                        text=text,
+                        metadata=meta_template.copy(),
+                    ))
+                if tail is not None:
+                    chunks.append(Chunk(
+                        id=_make_id("knowva", str(article_id), str(i), str(len(rolled))),
+                        text=tail[:3000],
+                        metadata=meta_template.copy(),
                     ))
             else:
                 chunks.append(Chunk(
                     id=_make_id("knowva", str(article_id), str(i)),
                     text=full_text[:3000],
-                    metadata={
-                        "source": "knowva",
-                        "article_id": str(article_id),
-                        "article_name": article_name,
-                        "content_type": "guidance",
-                    },
+                    metadata=meta_template.copy(),
                 ))
     else:
         # No headings - keep whole article as one chunk (or split by paragraphs if long)
@@ -244,43 +328,21 @@ def chunk_knowva(
             chunks.append(Chunk(
                 id=_make_id("knowva", str(article_id), "full"),
                 text=full_text[:3000],
-                metadata={
-                    "source": "knowva",
-                    "article_id": str(article_id),
-                    "article_name": article_name,
-                    "content_type": "guidance",
-                },
+                metadata=meta_template.copy(),
             ))
         else:
-            paragraphs = full_text.split("\n\n")
-            current = ""
-            idx = 0
-            for para in paragraphs:
-                if len(current) + len(para) > 3000 and current:
-                    chunks.append(Chunk(
-                        id=_make_id("knowva", str(article_id), str(idx)),
-                        text=current.strip()[:3000],
-                        metadata={
-                            "source": "knowva",
-                            "article_id": str(article_id),
-                            "article_name": article_name,
-                            "content_type": "guidance",
-                        },
-                    ))
-                    current = title_prefix + para + "\n\n"
-                    idx += 1
-                else:
-                    current += para + "\n\n"
-            if current.strip() and len(current.strip()) > len(title_prefix):
+            rolled, tail = _rollover_paragraphs(full_text, title_prefix)
+            for idx, text in enumerate(rolled):
                 chunks.append(Chunk(
                     id=_make_id("knowva", str(article_id), str(idx)),
-                    text=current.strip()[:3000],
-                    metadata={
-                        "source": "knowva",
-                        "article_id": str(article_id),
-                        "article_name": article_name,
-                        "content_type": "guidance",
-                    },
+                    text=text[:3000],
+                    metadata=meta_template.copy(),
+                ))
+            if tail is not None:
+                chunks.append(Chunk(
+                    id=_make_id("knowva", str(article_id), str(len(rolled))),
+                    text=tail[:3000],
+                    metadata=meta_template.copy(),
                 ))
 
     return chunks
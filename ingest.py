@@ -4,12 +4,18 @@
 import argparse
 import logging
 import sys
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, TypeVar
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 import rag
-from chunker import Chunk, chunk_cfr_part3, chunk_cfr_part4, chunk_knowva
+from chunker import Chunk, DcInfo, chunk_cfr_part3, chunk_cfr_part4, chunk_knowva
 
 logging.basicConfig(
     level=logging.INFO,
@@ -19,59 +25,67 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 REQUEST_TIMEOUT = 30
+INGEST_WORKERS = 6
+# Minimum spacing between request starts across all workers (~5 req/s)
+MIN_REQUEST_INTERVAL = 0.2
+# Chunks handed to rag.add_chunks per call while streaming an ingest
+INDEX_BATCH_SIZE = 128
+
+T = TypeVar("T")
+R = TypeVar("R")
 
 # DC_LOOKUP imported from app.py at runtime would create circular deps,
 # so we duplicate the section->schedule mapping here for Part 4 chunking
-DC_LOOKUP = {
-    "9411": {"condition": "PTSD", "section": "130", "part": "4", "schedule": "Mental Disorders"},
-    "9434": {"condition": "Major Depressive Disorder", "section": "130", "part": "4", "schedule": "Mental Disorders"},
-    "9400": {"condition": "Generalized Anxiety Disorder", "section": "130", "part": "4", "schedule": "Mental Disorders"},
-    "9201": {"condition": "Schizophrenia", "section": "130", "part": "4", "schedule": "Mental Disorders"},
-    "9432": {"condition": "Bipolar Disorder", "section": "130", "part": "4", "schedule": "Mental Disorders"},
-    "9413": {"condition": "Unspecified Anxiety Disorder", "section": "130", "part": "4", "schedule": "Mental Disorders"},
-    "9440": {"condition": "Chronic Adjustment Disorder", "section": "130", "part": "4", "schedule": "Mental Disorders"},
-    "6602": {"condition": "Asthma (Bronchial)", "section": "97", "part": "4", "schedule": "Respiratory System"},
-    "6604": {"condition": "COPD", "section": "97", "part": "4", "schedule": "Respiratory System"},
-    "6847": {"condition": "Sleep Apnea (Obstructive)", "section": "97", "part": "4", "schedule": "Respiratory System"},
-    "6600": {"condition": "Bronchitis (Chronic)", "section": "97", "part": "4", "schedule": "Respiratory System"},
-    "6845": {"condition": "Restrictive Lung Disease", "section": "97", "part": "4", "schedule": "Respiratory System"},
-    "5201": {"condition": "Arm (Limitation of Motion)", "section": "71a", "part": "4", "schedule": "Musculoskeletal System"},
-    "5003": {"condition": "Arthritis (Degenerative)", "section": "71a", "part": "4", "schedule": "Musculoskeletal System"},
-    "5010": {"condition": "Arthritis (Traumatic)", "section": "71a", "part": "4", "schedule": "Musculoskeletal System"},
-    "5237": {"condition": "Lumbosacral Strain", "section": "71a", "part": "4", "schedule": "Musculoskeletal System"},
-    "5242": {"condition": "Degenerative Arthritis of the Spine", "section": "71a", "part": "4", "schedule": "Musculoskeletal System"},
-    "5243": {"condition": "Intervertebral Disc Syndrome (IVDS)", "section": "71a", "part": "4", "schedule": "Musculoskeletal System"},
-    "5260": {"condition": "Leg (Limitation of Flexion)", "section": "71a", "part": "4", "schedule": "Musculoskeletal System"},
-    "5261": {"condition": "Leg (Limitation of Extension)", "section": "71a", "part": "4", "schedule": "Musculoskeletal System"},
-    "5271": {"condition": "Ankle (Limited Motion)", "section": "71a", "part": "4", "schedule": "Musculoskeletal System"},
-    "8045": {"condition": "Traumatic Brain Injury (TBI)", "section": "124a", "part": "4", "schedule": "Neurological Conditions"},
-    "8100": {"condition": "Migraine Headaches", "section": "124a", "part": "4", "schedule": "Neurological Conditions"},
-    "8520": {"condition": "Sciatic Nerve (Paralysis)", "section": "124a", "part": "4", "schedule": "Neurological Conditions"},
-    "8515": {"condition": "Median Nerve (Paralysis)", "section": "124a", "part": "4", "schedule": "Neurological Conditions"},
-    "8516": {"condition": "Ulnar Nerve (Paralysis)", "section": "124a", "part": "4", "schedule": "Neurological Conditions"},
-    "8510": {"condition": "Upper Radicular Group (Paralysis)", "section": "124a", "part": "4", "schedule": "Neurological Conditions"},
-    "6100": {"condition": "Hearing Loss (Bilateral)", "section": "85", "part": "4", "schedule": "Ear"},
-    "6260": {"condition": "Tinnitus", "section": "87", "part": "4", "schedule": "Ear"},
-    "7005": {"condition": "Coronary Artery Disease", "section": "104", "part": "4", "schedule": "Cardiovascular System"},
-    "7101": {"condition": "Hypertension", "section": "104", "part": "4", "schedule": "Cardiovascular System"},
-    "7110": {"condition": "Aortic Aneurysm", "section": "104", "part": "4", "schedule": "Cardiovascular System"},
-    "7806": {"condition": "Dermatitis/Eczema", "section": "118", "part": "4", "schedule": "Skin"},
-    "7800": {"condition": "Burn Scars (Head/Face/Neck)", "section": "118", "part": "4", "schedule": "Skin"},
-    "7801": {"condition": "Burn Scars (Other)", "section": "118", "part": "4", "schedule": "Skin"},
-    "7804": {"condition": "Unstable/Painful Scars", "section": "118", "part": "4", "schedule": "Skin"},
-    "7346": {"condition": "GERD (Hiatal Hernia)", "section": "114", "part": "4", "schedule": "Digestive System"},
-    "7319": {"condition": "Irritable Bowel Syndrome (IBS)", "section": "114", "part": "4", "schedule": "Digestive System"},
-    "7323": {"condition": "Ulcerative Colitis", "section": "114", "part": "4", "schedule": "Digestive System"},
-    "7913": {"condition": "Diabetes Mellitus (Type II)", "section": "119", "part": "4", "schedule": "Endocrine System"},
-    "7900": {"condition": "Hyperthyroidism", "section": "119", "part": "4", "schedule": "Endocrine System"},
-    "7528": {"condition": "Malignant Neoplasms (Genitourinary)", "section": "115a", "part": "4", "schedule": "Genitourinary System"},
-    "7522": {"condition": "Erectile Dysfunction", "section": "115a", "part": "4", "schedule": "Genitourinary System"},
-    "6066": {"condition": "Visual Acuity Loss", "section": "79", "part": "4", "schedule": "Eye"},
-    "9905": {"condition": "TMJ (Temporomandibular)", "section": "150", "part": "4", "schedule": "Dental and Oral Conditions"},
-    "7629": {"condition": "Endometriosis", "section": "116", "part": "4", "schedule": "Gynecological Conditions"},
-    "6354": {"condition": "Chronic Fatigue Syndrome", "section": "88b", "part": "4", "schedule": "Infectious Diseases"},
-    "7702": {"condition": "Agranulocytosis", "section": "117", "part": "4", "schedule": "Hemic and Lymphatic Systems"},
-    "8863": {"condition": "Gulf War Undiagnosed Illness", "section": "317", "part": "3", "schedule": "Undiagnosed Illness (38 CFR 3.317)"},
+DC_LOOKUP: Dict[str, DcInfo] = {
+    "9411": DcInfo("PTSD", "130", "4", "Mental Disorders"),
+    "9434": DcInfo("Major Depressive Disorder", "130", "4", "Mental Disorders"),
+    "9400": DcInfo("Generalized Anxiety Disorder", "130", "4", "Mental Disorders"),
+    "9201": DcInfo("Schizophrenia", "130", "4", "Mental Disorders"),
+    "9432": DcInfo("Bipolar Disorder", "130", "4", "Mental Disorders"),
+    "9413": DcInfo("Unspecified Anxiety Disorder", "130", "4", "Mental Disorders"),
+    "9440": DcInfo("Chronic Adjustment Disorder", "130", "4", "Mental Disorders"),
+    "6602": DcInfo("Asthma (Bronchial)", "97", "4", "Respiratory System"),
+    "6604": DcInfo("COPD", "97", "4", "Respiratory System"),
+    "6847": DcInfo("Sleep Apnea (Obstructive)", "97", "4", "Respiratory System"),
+    "6600": DcInfo("Bronchitis (Chronic)", "97", "4", "Respiratory System"),
+    "6845": DcInfo("Restrictive Lung Disease", "97", "4", "Respiratory System"),
+    "5201": DcInfo("Arm (Limitation of Motion)", "71a", "4", "Musculoskeletal System"),
+    "5003": DcInfo("Arthritis (Degenerative)", "71a", "4", "Musculoskeletal System"),
+    "5010": DcInfo("Arthritis (Traumatic)", "71a", "4", "Musculoskeletal System"),
+    "5237": DcInfo("Lumbosacral Strain", "71a", "4", "Musculoskeletal System"),
+    "5242": DcInfo("Degenerative Arthritis of the Spine", "71a", "4", "Musculoskeletal System"),
+    "5243": DcInfo("Intervertebral Disc Syndrome (IVDS)", "71a", "4", "Musculoskeletal System"),
+    "5260": DcInfo("Leg (Limitation of Flexion)", "71a", "4", "Musculoskeletal System"),
+    "5261": DcInfo("Leg (Limitation of Extension)", "71a", "4", "Musculoskeletal System"),
+    "5271": DcInfo("Ankle (Limited Motion)", "71a", "4", "Musculoskeletal System"),
+    "8045": DcInfo("Traumatic Brain Injury (TBI)", "124a", "4", "Neurological Conditions"),
+    "8100": DcInfo("Migraine Headaches", "124a", "4", "Neurological Conditions"),
+    "8520": DcInfo("Sciatic Nerve (Paralysis)", "124a", "4", "Neurological Conditions"),
+    "8515": DcInfo("Median Nerve (Paralysis)", "124a", "4", "Neurological Conditions"),
+    "8516": DcInfo("Ulnar Nerve (Paralysis)", "124a", "4", "Neurological Conditions"),
+    "8510": DcInfo("Upper Radicular Group (Paralysis)", "124a", "4", "Neurological Conditions"),
+    "6100": DcInfo("Hearing Loss (Bilateral)", "85", "4", "Ear"),
+    "6260": DcInfo("Tinnitus", "87", "4", "Ear"),
+    "7005": DcInfo("Coronary Artery Disease", "104", "4", "Cardiovascular System"),
+    "7101": DcInfo("Hypertension", "104", "4", "Cardiovascular System"),
+    "7110": DcInfo("Aortic Aneurysm", "104", "4", "Cardiovascular System"),
+    "7806": DcInfo("Dermatitis/Eczema", "118", "4", "Skin"),
+    "7800": DcInfo("Burn Scars (Head/Face/Neck)", "118", "4", "Skin"),
+    "7801": DcInfo("Burn Scars (Other)", "118", "4", "Skin"),
+    "7804": DcInfo("Unstable/Painful Scars", "118", "4", "Skin"),
+    "7346": DcInfo("GERD (Hiatal Hernia)", "114", "4", "Digestive System"),
+    "7319": DcInfo("Irritable Bowel Syndrome (IBS)", "114", "4", "Digestive System"),
+    "7323": DcInfo("Ulcerative Colitis", "114", "4", "Digestive System"),
+    "7913": DcInfo("Diabetes Mellitus (Type II)", "119", "4", "Endocrine System"),
+    "7900": DcInfo("Hyperthyroidism", "119", "4", "Endocrine System"),
+    "7528": DcInfo("Malignant Neoplasms (Genitourinary)", "115a", "4", "Genitourinary System"),
+    "7522": DcInfo("Erectile Dysfunction", "115a", "4", "Genitourinary System"),
+    "6066": DcInfo("Visual Acuity Loss", "79", "4", "Eye"),
+    "9905": DcInfo("TMJ (Temporomandibular)", "150", "4", "Dental and Oral Conditions"),
+    "7629": DcInfo("Endometriosis", "116", "4", "Gynecological Conditions"),
+    "6354": DcInfo("Chronic Fatigue Syndrome", "88b", "4", "Infectious Diseases"),
+    "7702": DcInfo("Agranulocytosis", "117", "4", "Hemic and Lymphatic Systems"),
+    "8863": DcInfo("Gulf War Undiagnosed Illness", "317", "3", "Undiagnosed Illness (38 CFR 3.317)"),
 }
 
 # Part 3 key sections to index
@@ -90,57 +104,151 @@ KNOWVA_SEARCH_TERMS = [
 ]
 
 
+def _make_session() -> requests.Session:
+    s = requests.Session()
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s
+
+
+# One keep-alive session for the whole ingest run instead of a new
+# connection (and TLS handshake) per requests.get()
+_SESSION = _make_session()
+
+
+class _RateLimiter:
+    """Space request starts at least `interval` seconds apart across threads."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+_LIMITER = _RateLimiter(MIN_REQUEST_INTERVAL)
+
+
+def _map_concurrent(
+    fn: Callable[[T], R], items: Iterable[T], stop: Optional[threading.Event] = None,
+) -> Iterator[R]:
+    """Run fn over items on a small thread pool; results are yielded in input order.
+
+    At most ``INGEST_WORKERS * 2`` items are submitted ahead of the consumer,
+    so a slow consumer holds back fetching instead of buffering every result.
+    Once ``stop`` is set no further items are submitted and queued ones are
+    cancelled.
+    """
+    with ThreadPoolExecutor(max_workers=INGEST_WORKERS) as ex:
+        pending = deque()
+        try:
+            for item in items:
+                if stop is not None and stop.is_set():
+                    return
+                pending.append(ex.submit(fn, item))
+                if len(pending) >= INGEST_WORKERS * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            # Also runs when the consumer abandons the generator early
+            for fut in pending:
+                fut.cancel()
+
+
 def _api_get(api_url: str, path: str, params: dict = None) -> dict:
     """Make GET request to BVA API."""
     url = f"{api_url}/{path}"
-    resp = requests.get(url, params=params or {}, timeout=REQUEST_TIMEOUT)
+    _LIMITER.wait()
+    resp = _SESSION.get(url, params=params or {}, timeout=REQUEST_TIMEOUT)
     resp.raise_for_status()
     return resp.json()
 
 
-def ingest_cfr_part4(api_url: str) -> list[Chunk]:
+def _fetch_and_chunk_part4(api_url: str, section: str) -> list[Chunk]:
+    logger.info(f"Fetching CFR Part 4 section {section}...")
+    try:
+        data = _api_get(api_url, "cfr/section", {"part": "4", "section": section})
+        markdown = data.get("content_markdown", "")
+        chunks = chunk_cfr_part4(markdown, "4", section, DC_LOOKUP)
+        logger.info(f"  -> {len(chunks)} chunks from 4.{section}")
+        return chunks
+    except Exception as e:
+        logger.error(f"  -> Failed to fetch 4.{section}: {e}")
+        return []
+
+
+def ingest_cfr_part4(api_url: str, stop: Optional[threading.Event] = None) -> Iterator[Chunk]:
     """Fetch and chunk Part 4 rating criteria sections."""
     # Get unique sections from DC_LOOKUP
     sections = set()
     for info in DC_LOOKUP.values():
-        if info["part"] == "4":
-            sections.add(info["section"])
+        if info.part == "4":
+            sections.add(info.section)
 
-    all_chunks = []
-    for section in sorted(sections):
-        logger.info(f"Fetching CFR Part 4 section {section}...")
-        try:
-            data = _api_get(api_url, "cfr/section", {"part": "4", "section": section})
-            markdown = data.get("content_markdown", "")
-            chunks = chunk_cfr_part4(markdown, "4", section, DC_LOOKUP)
-            all_chunks.extend(chunks)
-            logger.info(f"  -> {len(chunks)} chunks from 4.{section}")
-            time.sleep(0.5)  # Rate limit eCFR
-        except Exception as e:
-            logger.error(f"  -> Failed to fetch 4.{section}: {e}")
+    for chunks in _map_concurrent(lambda s: _fetch_and_chunk_part4(api_url, s), sorted(sections), stop):
+        yield from chunks
 
-    return all_chunks
 
+def _fetch_and_chunk_part3(api_url: str, section: str) -> list[Chunk]:
+    logger.info(f"Fetching CFR Part 3 section {section}...")
+    try:
+        data = _api_get(api_url, "cfr/section", {"part": "3", "section": section})
+        markdown = data.get("content_markdown", "")
+        chunks = chunk_cfr_part3(markdown, "3", section)
+        logger.info(f"  -> {len(chunks)} chunks from 3.{section}")
+        return chunks
+    except Exception as e:
+        logger.error(f"  -> Failed to fetch 3.{section}: {e}")
+        return []
 
-def ingest_cfr_part3(api_url: str) -> list[Chunk]:
+
+def ingest_cfr_part3(api_url: str, stop: Optional[threading.Event] = None) -> Iterator[Chunk]:
     """Fetch and chunk Part 3 adjudication sections."""
-    all_chunks = []
-    for section in PART3_SECTIONS:
-        logger.info(f"Fetching CFR Part 3 section {section}...")
-        try:
-            data = _api_get(api_url, "cfr/section", {"part": "3", "section": section})
-            markdown = data.get("content_markdown", "")
-            chunks = chunk_cfr_part3(markdown, "3", section)
-            all_chunks.extend(chunks)
-            logger.info(f"  -> {len(chunks)} chunks from 3.{section}")
-            time.sleep(0.5)
-        except Exception as e:
-            logger.error(f"  -> Failed to fetch 3.{section}: {e}")
+    for chunks in _map_concurrent(lambda s: _fetch_and_chunk_part3(api_url, s), PART3_SECTIONS, stop):
+        yield from chunks
 
-    return all_chunks
+
+def _search_knowva(api_url: str, term: str) -> list:
+    logger.info(f"Searching KnowVA for '{term}'...")
+    try:
+        return _api_get(api_url, "knowva/search", {"q": term, "pagesize": 10}).get("results", [])
+    except Exception as e:
+        logger.error(f"  -> KnowVA search failed for '{term}': {e}")
+        return []
 
 
-def ingest_knowva(api_url: str) -> list[Chunk]:
+def _fetch_and_chunk_article(api_url: str, article_id: int, article_name: str) -> list[Chunk]:
+    logger.info(f"Fetching KnowVA article {article_id}: {article_name[:60]}...")
+    try:
+        data = _api_get(api_url, f"knowva/article/{article_id}")
+        content = data.get("content", "")
+        name = data.get("name", article_name)
+        if not content:
+            logger.warning(f"  -> Empty content for article {article_id}")
+            return []
+        chunks = chunk_knowva(content, article_id, name)
+        logger.info(f"  -> {len(chunks)} chunks")
+        return chunks
+    except Exception as e:
+        logger.error(f"  -> Failed to fetch article {article_id}: {e}")
+        return []
+
+
+def ingest_knowva(api_url: str, stop: Optional[threading.Event] = None) -> Iterator[Chunk]:
     """Fetch and chunk KnowVA articles from popular + search results."""
     seen_ids = set()
     articles_to_fetch = []
@@ -156,40 +264,89 @@ def ingest_knowva(api_url: str) -> list[Chunk]:
     except Exception as e:
         logger.error(f"Failed to fetch popular articles: {e}")
 
-    # Search for key terms
-    for term in KNOWVA_SEARCH_TERMS:
-        logger.info(f"Searching KnowVA for '{term}'...")
-        try:
-            data = _api_get(api_url, "knowva/search", {"q": term, "pagesize": 10})
-            for item in data.get("results", []):
-                if item["id"] not in seen_ids:
-                    seen_ids.add(item["id"])
-                    articles_to_fetch.append((item["id"], item.get("name", "")))
-            time.sleep(0.3)
-        except Exception as e:
-            logger.error(f"  -> KnowVA search failed for '{term}': {e}")
+    # Search for key terms (merged in term order so discovery order is stable)
+    for results in _map_concurrent(lambda t: _search_knowva(api_url, t), KNOWVA_SEARCH_TERMS, stop):
+        for item in results:
+            if item["id"] not in seen_ids:
+                seen_ids.add(item["id"])
+                articles_to_fetch.append((item["id"], item.get("name", "")))
 
     logger.info(f"Found {len(articles_to_fetch)} unique KnowVA articles to index")
 
     # Fetch full content and chunk
-    all_chunks = []
-    for article_id, article_name in articles_to_fetch:
-        logger.info(f"Fetching KnowVA article {article_id}: {article_name[:60]}...")
-        try:
-            data = _api_get(api_url, f"knowva/article/{article_id}")
-            content = data.get("content", "")
-            name = data.get("name", article_name)
-            if not content:
-                logger.warning(f"  -> Empty content for article {article_id}")
-                continue
-            chunks = chunk_knowva(content, article_id, name)
-            all_chunks.extend(chunks)
-            logger.info(f"  -> {len(chunks)} chunks")
-            time.sleep(0.3)
-        except Exception as e:
-            logger.error(f"  -> Failed to fetch article {article_id}: {e}")
+    for chunks in _map_concurrent(lambda a: _fetch_and_chunk_article(api_url, *a), articles_to_fetch, stop):
+        yield from chunks
 
-    return all_chunks
+
+def iter_source_chunks(
+    api_url: str, source: str = "all", stop: Optional[threading.Event] = None,
+) -> Iterator[Chunk]:
+    """Lazily fetch and chunk every section/article for the given source (cfr, knowva, all)."""
+    if source in ("cfr", "all"):
+        logger.info("=== Ingesting CFR Part 4 (Rating Criteria) ===")
+        yield from ingest_cfr_part4(api_url, stop)
+
+        logger.info("=== Ingesting CFR Part 3 (Adjudication) ===")
+        yield from ingest_cfr_part3(api_url, stop)
+
+    if source in ("knowva", "all"):
+        logger.info("=== Ingesting KnowVA Articles ===")
+        yield from ingest_knowva(api_url, stop)
+
+
+def index_chunks(
+    chunks: Iterable[Chunk],
+    batch_size: int = INDEX_BATCH_SIZE,
+    skip_ids: Optional[Set[str]] = None,
+    stop: Optional[threading.Event] = None,
+) -> int:
+    """Upsert chunks in fixed-size batches as they are produced. Returns count indexed.
+
+    Only the current batch plus a bounded window of in-flight fetches (see
+    ``_map_concurrent``) is held in memory; that window keeps fetching while
+    the current batch is embedded. Chunks whose ID is in ``skip_ids`` are not
+    re-embedded; the set is updated as chunks are indexed so repeats within
+    the run are dropped too. Setting ``stop`` ends the run before the next
+    batch is embedded; the partial batch is dropped.
+    """
+    indexed = 0
+    skipped = 0
+    batch: List[Chunk] = []
+    for chunk in chunks:
+        if skip_ids is not None:
+            if chunk.id in skip_ids:
+                skipped += 1
+                continue
+            skip_ids.add(chunk.id)
+        batch.append(chunk)
+        if len(batch) >= batch_size:
+            if stop is not None and stop.is_set():
+                break
+            indexed += rag.add_chunks(batch)
+            logger.info(f"Indexed {indexed} chunks so far")
+            batch = []
+    if stop is not None and stop.is_set():
+        logger.info(f"Indexing stopped early after {indexed} chunks")
+    elif batch:
+        indexed += rag.add_chunks(batch)
+    if skipped:
+        logger.info(f"Skipped {skipped} chunks already in the index")
+    return indexed
+
+
+def index_sources(
+    api_url: str, source: str = "all", skip_existing: bool = False,
+    stop: Optional[threading.Event] = None,
+) -> int:
+    """Fetch, chunk and index the given source. Returns count indexed.
+
+    With ``skip_existing``, chunk IDs already in the collection are not
+    re-upserted. IDs are positional rather than content hashes, so this misses
+    edits to already-indexed sections; use it for resuming, not refreshing.
+    ``stop`` lets a caller (the app on shutdown) end the run between batches.
+    """
+    skip_ids = rag.existing_ids() if skip_existing else None
+    return index_chunks(iter_source_chunks(api_url, source, stop), skip_ids=skip_ids, stop=stop)
 
 
 def main():
@@ -210,6 +367,11 @@ def main():
         action="store_true",
         help="Clear existing index before ingesting",
     )
+    parser.add_argument(
+        "--skip-existing",
+        action="store_true",
+        help="Don't re-embed chunks whose ID is already indexed (resume an interrupted run)",
+    )
     args = parser.parse_args()
 
     logger.info(f"Starting ingest: source={args.source}, api={args.api_url}")
@@ -226,22 +388,8 @@ def main():
         cleared = rag.clear_collection()
         logger.info(f"Cleared {cleared} existing chunks")
 
-    all_chunks: list[Chunk] = []
-
-    if args.source in ("cfr", "all"):
-        logger.info("=== Ingesting CFR Part 4 (Rating Criteria) ===")
-        all_chunks.extend(ingest_cfr_part4(args.api_url))
-
-        logger.info("=== Ingesting CFR Part 3 (Adjudication) ===")
-        all_chunks.extend(ingest_cfr_part3(args.api_url))
-
-    if args.source in ("knowva", "all"):
-        logger.info("=== Ingesting KnowVA Articles ===")
-        all_chunks.extend(ingest_knowva(args.api_url))
-
-    if all_chunks:
-        logger.info(f"=== Indexing {len(all_chunks)} total chunks ===")
-        indexed = rag.add_chunks(all_chunks)
+    indexed = index_sources(args.api_url, args.source, skip_existing=args.skip_existing)
+    if indexed:
         logger.info(f"Indexed {indexed} chunks successfully")
     else:
         logger.warning("No chunks to index")
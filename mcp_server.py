@@ -1,12 +1,14 @@
 #!/usr/bin/env python3
 """BVA Decision Search MCP Server - wraps the BVA API for LLM tool use."""
 
-import json
+import asyncio
 import os
 from typing import Optional, List
 
 import httpx
+import orjson
 import uvicorn
+from cachetools import LRUCache, TTLCache
 from mcp.server.fastmcp import FastMCP
 from starlette.middleware.cors import CORSMiddleware
 
@@ -18,29 +20,139 @@ mcp = FastMCP("bva_mcp", host=_host, port=_port)
 API_BASE = os.environ.get("BVA_API_URL", "http://localhost:8001")
 TIMEOUT = 30.0
 
+# Read timeouts per API route, looked up by full path and then by its first
+# segment; anything unlisted uses TIMEOUT. Searches fail fast, extract fans
+# out over many cases and gets much longer.
+HTTP_TIMEOUTS = {
+    "search": 20.0,
+    "search/extract": 120.0,
+    "rag": 20.0,
+    "case": TIMEOUT,
+    "analyze": TIMEOUT,
+}
+
+
+def _timeout_for(path: str) -> httpx.Timeout:
+    read = HTTP_TIMEOUTS.get(path) or HTTP_TIMEOUTS.get(path.split("/", 1)[0], TIMEOUT)
+    return httpx.Timeout(read, connect=5.0)
+
+# HTTP/2 lets concurrent tool calls multiplex over one connection to an https
+# API_BASE (plain http:// stays on HTTP/1.1). Needs the h2 package, which
+# httpx[http2] pulls in; without it the client falls back to HTTP/1.1.
+try:
+    import h2  # noqa: F401
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+# libuv event loop for faster socket dispatch under many concurrent tool
+# calls; shipped with uvicorn[standard] on Linux/macOS, absent on Windows.
+try:
+    import uvloop
+    _HAS_UVLOOP = True
+except ImportError:
+    _HAS_UVLOOP = False
+
+# One pooled client for every tool call so connections to the API are kept
+# alive and reused instead of a new TCP (+TLS) handshake per call. Created on
+# first use inside the running event loop and kept for the process lifetime;
+# creation never awaits, so no lock is needed around it.
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            base_url=API_BASE,
+            http2=_HTTP2,
+            timeout=httpx.Timeout(TIMEOUT, connect=5.0),
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=128),
+        )
+    return _client
+
+
+# Fan bva_batch_search out as concurrent GET /search calls over the pooled
+# client instead of one POST /batch/search (e.g. for API deployments without
+# the batch route). Off by default.
+BATCH_CLIENT_SIDE = os.environ.get("BVA_BATCH_CLIENT_SIDE", "").lower() in ("1", "true", "yes")
+BATCH_CLIENT_CONCURRENCY = 10
+
+# Serialized tool output for effectively static reference data (years, CFR
+# structure, KnowVA topics/popular) and for individual CFR sections / KnowVA
+# articles, so repeat tool calls skip the API round trip and re-encoding.
+_REFERENCE_CACHE: TTLCache = TTLCache(maxsize=64, ttl=3600)
+_DOCUMENT_CACHE: TTLCache = TTLCache(maxsize=512, ttl=1800)
+
+# Last body per (path, params) that came with an ETag/Last-Modified, so the
+# next GET can revalidate and a 304 reuses it without transferring the body
+_VALIDATED: LRUCache = LRUCache(maxsize=256)
+
 
 # --- shared helpers ---
 
+def _drop_none(params: dict) -> dict:
+    # Most calls pass no None values; skip the rebuild for those.
+    if None in params.values():
+        return {k: v for k, v in params.items() if v is not None}
+    return params
+
+
 async def _get(path: str, **params) -> dict:
-    filtered = {k: v for k, v in params.items() if v is not None}
-    async with httpx.AsyncClient() as c:
-        r = await c.get(f"{API_BASE}/{path}", params=filtered, timeout=TIMEOUT)
-        r.raise_for_status()
-        return r.json()
+    filtered = _drop_none(params)
+    r = await _get_client().get(path, params=filtered, timeout=_timeout_for(path))
+    r.raise_for_status()
+    return orjson.loads(r.content)
+
 
+# Pass-through variants: most tools only hand the API's JSON to the model, so
+# return the body as-is instead of decoding it and re-encoding it with indent.
 
-async def _post(path: str, body: dict) -> dict:
-    async with httpx.AsyncClient() as c:
-        r = await c.post(f"{API_BASE}/{path}", json=body, timeout=TIMEOUT)
-        r.raise_for_status()
-        return r.json()
+async def _get_text(path: str, **params) -> str:
+    filtered = _drop_none(params)
+    try:
+        key = (path, frozenset(filtered.items()))
+    except TypeError:  # list-valued params (e.g. codes=[...]) aren't revalidated
+        key = None
+    stored = _VALIDATED.get(key) if key is not None else None
+    headers = {}
+    if stored is not None:
+        etag, last_modified, _ = stored
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+    r = await _get_client().get(path, params=filtered, headers=headers, timeout=_timeout_for(path))
+    if r.status_code == 304 and stored is not None:
+        return stored[2]
+    r.raise_for_status()
+    etag, last_modified = r.headers.get("etag"), r.headers.get("last-modified")
+    if key is not None and (etag or last_modified):
+        _VALIDATED[key] = (etag, last_modified, r.text)
+    return r.text
+
+
+async def _post_text(path: str, body: dict) -> str:
+    r = await _get_client().post(path, json=body, timeout=_timeout_for(path))
+    r.raise_for_status()
+    return r.text
+
+
+async def _get_text_cached(cache: TTLCache, path: str, **params) -> str:
+    """_get_text memoized in cache. Errors are not cached."""
+    key = (path, tuple(sorted(params.items())))
+    out = cache.get(key)
+    if out is None:
+        out = await _get_text(path, **params)
+        cache[key] = out
+    return out
 
 
 def _err(e: Exception) -> str:
     if isinstance(e, httpx.HTTPStatusError):
         return f"HTTP {e.response.status_code}: {e.response.text[:300]}"
     if isinstance(e, httpx.TimeoutException):
-        return "Request timed out after 30 seconds"
+        return "Request to the BVA API timed out"
     if isinstance(e, httpx.ConnectError):
         return f"Could not connect to BVA API at {API_BASE}"
     return str(e)
@@ -63,12 +175,29 @@ async def bva_search(
 ) -> str:
     """Search BVA decisions. q=search query, year=optional year filter (1992-2025), page=page number."""
     try:
-        data = await _get("search", q=q, year=year, page=page)
-        return json.dumps(data, indent=2)
+        return await _get_text("search", q=q, year=year, page=page)
     except Exception as e:
         return f"Error: {_err(e)}"
 
 
+async def _batch_search_client_side(queries: List[str], year: Optional[int], page: int) -> list:
+    """Same result shape as POST /batch/search, built from concurrent GET /search calls."""
+    sem = asyncio.Semaphore(BATCH_CLIENT_CONCURRENCY)
+
+    async def _one(q: str) -> dict:
+        try:
+            async with sem:
+                data = await _get("search", q=q, year=year, page=page)
+            results = data.get("results", [])
+            return {"query": q, "total": data.get("total", 0), "count": len(results), "results": results}
+        except Exception:
+            # Match the server: a failed query yields an empty result, not an error
+            return {"query": q, "total": 0, "count": 0, "results": []}
+
+    stripped = [q.strip() for q in queries if q.strip()]
+    return list(await asyncio.gather(*(_one(q) for q in stripped)))
+
+
 @mcp.tool(
     description=(
         "Run multiple BVA decision searches in a single call. "
@@ -83,11 +212,13 @@ async def bva_batch_search(
 ) -> str:
     """Batch search BVA decisions. queries=list of search strings, year=optional filter, page=page number."""
     try:
+        if BATCH_CLIENT_SIDE:
+            data = await _batch_search_client_side(queries, year, page)
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
         body = {"queries": queries, "page": page}
         if year is not None:
             body["year"] = year
-        data = await _post("batch/search", body)
-        return json.dumps(data, indent=2)
+        return await _post_text("batch/search", body)
     except Exception as e:
         return f"Error: {_err(e)}"
 
@@ -125,11 +256,7 @@ async def bva_search_extract(
         }
         if year is not None:
             body["year"] = year
-        async with httpx.AsyncClient() as c:
-            r = await c.post(f"{API_BASE}/search/extract", json=body, timeout=120.0)
-            r.raise_for_status()
-            data = r.json()
-        return json.dumps(data, indent=2)
+        return await _post_text("search/extract", body)
     except Exception as e:
         return f"Error: {_err(e)}"
 
@@ -143,8 +270,7 @@ async def bva_search_extract(
 async def bva_list_years() -> str:
     """List available BVA decision years with their internal collection IDs."""
     try:
-        data = await _get("years")
-        return json.dumps(data, indent=2)
+        return await _get_text_cached(_REFERENCE_CACHE, "years")
     except Exception as e:
         return f"Error: {_err(e)}"
 
@@ -166,8 +292,7 @@ async def bva_get_case(
 ) -> str:
     """Get parsed BVA case details. url=case URL from search results, full_text=include full decision text."""
     try:
-        data = await _get("case", url=url, full_text=full_text)
-        return json.dumps(data, indent=2)
+        return await _get_text("case", url=url, full_text=full_text)
     except Exception as e:
         return f"Error: {_err(e)}"
 
@@ -182,10 +307,16 @@ async def bva_get_case(
 async def bva_get_case_text(url: str) -> str:
     """Get raw text of a BVA decision. url=case URL from search results."""
     try:
-        async with httpx.AsyncClient() as c:
-            r = await c.get(f"{API_BASE}/case/text", params={"url": url}, timeout=TIMEOUT)
-            r.raise_for_status()
-            return r.text
+        # Decode the body in 64 KB pieces as it arrives rather than buffering
+        # the whole decision as bytes and then decoding a second full copy
+        async with _get_client().stream(
+            "GET", "case/text", params={"url": url}, timeout=_timeout_for("case/text"),
+        ) as r:
+            if r.is_error:
+                await r.aread()  # so _err() can quote the error body
+                r.raise_for_status()
+            parts = [chunk async for chunk in r.aiter_text(chunk_size=65536)]
+        return "".join(parts)
     except Exception as e:
         return f"Error: {_err(e)}"
 
@@ -204,19 +335,8 @@ async def bva_analyze_case(
 ) -> str:
     """Analyze a BVA decision for keyword frequency. url=case URL, keywords=optional list of terms to count."""
     try:
-        params: dict = {"url": url}
-        if keywords:
-            # httpx accepts list params as repeated keys
-            async with httpx.AsyncClient() as c:
-                r = await c.get(
-                    f"{API_BASE}/analyze/text",
-                    params=[("url", url)] + [("keywords", k) for k in keywords],
-                    timeout=TIMEOUT,
-                )
-                r.raise_for_status()
-                return json.dumps(r.json(), indent=2)
-        data = await _get("analyze/text", url=url)
-        return json.dumps(data, indent=2)
+        # httpx sends list params as repeated keys (keywords=a&keywords=b)
+        return await _get_text("analyze/text", url=url, keywords=keywords or None)
     except Exception as e:
         return f"Error: {_err(e)}"
 
@@ -237,8 +357,7 @@ async def bva_knowva_search(
 ) -> str:
     """Search the VA KnowVA knowledge base. q=search query, page=page number, pagesize=results per page."""
     try:
-        data = await _get("knowva/search", q=q, page=page, pagesize=pagesize)
-        return json.dumps(data, indent=2)
+        return await _get_text("knowva/search", q=q, page=page, pagesize=pagesize)
     except Exception as e:
         return f"Error: {_err(e)}"
 
@@ -253,8 +372,7 @@ async def bva_knowva_search(
 async def bva_knowva_article(article_id: int) -> str:
     """Fetch a KnowVA article by ID. article_id=numeric article ID from search results."""
     try:
-        data = await _get(f"knowva/article/{article_id}")
-        return json.dumps(data, indent=2)
+        return await _get_text_cached(_DOCUMENT_CACHE, f"knowva/article/{article_id}")
     except Exception as e:
         return f"Error: {_err(e)}"
 
@@ -269,8 +387,7 @@ async def bva_knowva_article(article_id: int) -> str:
 async def bva_knowva_topics() -> str:
     """List all KnowVA topics and categories."""
     try:
-        data = await _get("knowva/topics")
-        return json.dumps(data, indent=2)
+        return await _get_text_cached(_REFERENCE_CACHE, "knowva/topics")
     except Exception as e:
         return f"Error: {_err(e)}"
 
@@ -285,8 +402,7 @@ async def bva_knowva_topics() -> str:
 async def bva_knowva_popular(pagesize: int = 10) -> str:
     """Get most popular KnowVA articles. pagesize=number of articles to return (1-50)."""
     try:
-        data = await _get("knowva/popular", pagesize=pagesize)
-        return json.dumps(data, indent=2)
+        return await _get_text_cached(_REFERENCE_CACHE, "knowva/popular", pagesize=pagesize)
     except Exception as e:
         return f"Error: {_err(e)}"
 
@@ -309,8 +425,7 @@ async def bva_cfr_search(
 ) -> str:
     """Search 38 CFR regulations. q=search query, part=optional part filter (e.g. '3','4','19'), page=page number."""
     try:
-        data = await _get("cfr/search", q=q, part=part, page=page, per_page=per_page)
-        return json.dumps(data, indent=2)
+        return await _get_text("cfr/search", q=q, part=part, page=page, per_page=per_page)
     except Exception as e:
         return f"Error: {_err(e)}"
 
@@ -325,8 +440,7 @@ async def bva_cfr_search(
 async def bva_cfr_section(part: str, section: str) -> str:
     """Fetch a 38 CFR section. part=CFR part number (e.g. '3'), section=section number (e.g. '102')."""
     try:
-        data = await _get("cfr/section", part=part, section=section)
-        return json.dumps(data, indent=2)
+        return await _get_text_cached(_DOCUMENT_CACHE, "cfr/section", part=part, section=section)
     except Exception as e:
         return f"Error: {_err(e)}"
 
@@ -341,8 +455,7 @@ async def bva_cfr_section(part: str, section: str) -> str:
 async def bva_cfr_structure() -> str:
     """Get Title 38 CFR table of contents - all parts and sections."""
     try:
-        data = await _get("cfr/structure")
-        return json.dumps(data, indent=2)
+        return await _get_text_cached(_REFERENCE_CACHE, "cfr/structure")
     except Exception as e:
         return f"Error: {_err(e)}"
 
@@ -359,8 +472,22 @@ async def bva_cfr_structure() -> str:
 async def bva_cfr_dc_lookup(code: str) -> str:
     """Look up a diagnostic code. code=DC number (e.g. '9411' for PTSD, '6847' for sleep apnea)."""
     try:
-        data = await _get(f"cfr/dc/{code}")
-        return json.dumps(data, indent=2)
+        return await _get_text(f"cfr/dc/{code}")
+    except Exception as e:
+        return f"Error: {_err(e)}"
+
+
+@mcp.tool(
+    description=(
+        "Look up several VA diagnostic codes at once. Returns the condition, "
+        "38 CFR citation, and schedule for each known code, plus a not_found list. "
+        "Prefer this over repeated bva_cfr_dc_lookup calls. Example: codes=['9411', '6260', '5260']."
+    )
+)
+async def bva_cfr_dc_batch(codes: List[str]) -> str:
+    """Resolve multiple diagnostic codes. codes=list of DC numbers (e.g. ['9411', '6847'])."""
+    try:
+        return await _get_text("cfr/dc/batch", codes=codes)
     except Exception as e:
         return f"Error: {_err(e)}"
 
@@ -375,8 +502,7 @@ async def bva_cfr_dc_lookup(code: str) -> str:
 async def bva_cfr_dc_search(q: str) -> str:
     """Search diagnostic codes by condition name. q=condition name (e.g. 'PTSD', 'back pain', 'tinnitus')."""
     try:
-        data = await _get("cfr/dc", q=q)
-        return json.dumps(data, indent=2)
+        return await _get_text("cfr/dc", q=q)
     except Exception as e:
         return f"Error: {_err(e)}"
 
@@ -398,8 +524,7 @@ async def bva_fr_va_documents(
 ) -> str:
     """Get recent VA Federal Register documents. doc_type=Rule/Proposed Rule/Notice, page=page number."""
     try:
-        data = await _get("federal-register/va", type=doc_type, page=page, per_page=per_page)
-        return json.dumps(data, indent=2)
+        return await _get_text("federal-register/va", type=doc_type, page=page, per_page=per_page)
     except Exception as e:
         return f"Error: {_err(e)}"
 
@@ -422,11 +547,10 @@ async def bva_fr_search(
 ) -> str:
     """Search VA Federal Register documents. q=search query, doc_type=Rule/Proposed Rule/Notice."""
     try:
-        data = await _get(
+        return await _get_text(
             "federal-register/search", q=q, type=doc_type,
             cfr_title=cfr_title, cfr_part=cfr_part, page=page, per_page=per_page,
         )
-        return json.dumps(data, indent=2)
     except Exception as e:
         return f"Error: {_err(e)}"
 
@@ -453,11 +577,10 @@ async def bva_rag_search(
 ) -> str:
     """Semantic search over CFR and KnowVA content. q=search query, top_k=number of results (1-20)."""
     try:
-        data = await _get(
+        return await _get_text(
             "rag/search", q=q, content_type=content_type,
             part=part, schedule=schedule, source=source, top_k=top_k,
         )
-        return json.dumps(data, indent=2)
     except Exception as e:
         return f"Error: {_err(e)}"
 
@@ -472,8 +595,7 @@ async def bva_rag_search(
 async def bva_rag_status() -> str:
     """Get RAG index statistics - chunk counts by source and content type."""
     try:
-        data = await _get("rag/status")
-        return json.dumps(data, indent=2)
+        return await _get_text("rag/status")
     except Exception as e:
         return f"Error: {_err(e)}"
 
@@ -495,8 +617,7 @@ async def bva_cavc_search(
 ) -> str:
     """Search CAVC cases. case_number=e.g. '23-5171', party_name=e.g. 'Smith', open_closed=open/closed/both."""
     try:
-        data = await _get("cavc/search", case_number=case_number, party_name=party_name, open_closed=open_closed)
-        return json.dumps(data, indent=2)
+        return await _get_text("cavc/search", case_number=case_number, party_name=party_name, open_closed=open_closed)
     except Exception as e:
         return f"Error: {_err(e)}"
 
@@ -512,8 +633,7 @@ async def bva_cavc_search(
 async def bva_cavc_case(case_number: str) -> str:
     """Get CAVC case summary and docket. case_number=e.g. '23-5171'."""
     try:
-        data = await _get(f"cavc/case/{case_number}/docket")
-        return json.dumps(data, indent=2)
+        return await _get_text(f"cavc/case/{case_number}/docket")
     except Exception as e:
         return f"Error: {_err(e)}"
 
@@ -532,11 +652,10 @@ async def bva_cavc_document(
 ) -> str:
     """Fetch a CAVC document as text. dls_id=document link ID, case_id=internal case ID, case_number=e.g. '23-5171'."""
     try:
-        data = await _get(
+        return await _get_text(
             f"cavc/case/{case_number}/document",
             dls_id=dls_id, case_id=case_id, as_text="true",
         )
-        return json.dumps(data, indent=2)
     except Exception as e:
         return f"Error: {_err(e)}"
 
@@ -554,8 +673,7 @@ async def bva_cavc_find_entry(
 ) -> str:
     """Find a docket entry by keyword. case_number=e.g. '23-5171', keyword=e.g. 'brief'."""
     try:
-        data = await _get(f"cavc/case/{case_number}/find", keyword=keyword)
-        return json.dumps(data, indent=2)
+        return await _get_text(f"cavc/case/{case_number}/find", keyword=keyword)
     except Exception as e:
         return f"Error: {_err(e)}"
 
@@ -588,8 +706,7 @@ async def case_search(
             body["q"] = q
         if section:
             body["section"] = section
-        data = await _post("case/search", body)
-        return json.dumps(data, indent=2)
+        return await _post_text("case/search", body)
     except Exception as e:
         return f"Error: {_err(e)}"
 
@@ -603,8 +720,7 @@ async def case_search(
 async def case_search_presets() -> str:
     """List available BVA case search presets."""
     try:
-        data = await _get("case/search/presets")
-        return json.dumps(data, indent=2)
+        return await _get_text("case/search/presets")
     except Exception as e:
         return f"Error: {_err(e)}"
 
@@ -617,8 +733,7 @@ async def case_search_presets() -> str:
 async def bva_health() -> str:
     """Check BVA API health status."""
     try:
-        data = await _get("health")
-        return json.dumps(data, indent=2)
+        return await _get_text("health")
     except Exception as e:
         return f"Error: {_err(e)}"
 
@@ -632,6 +747,9 @@ if __name__ == "__main__":
             allow_methods=["*"],
             allow_headers=["*"],
         )
-        uvicorn.run(cors_app, host=_host, port=_port)
+        # loop="auto" already picks uvloop when it is installed; be explicit
+        uvicorn.run(cors_app, host=_host, port=_port, loop="uvloop" if _HAS_UVLOOP else "asyncio")
     else:
+        if _HAS_UVLOOP:
+            uvloop.install()  # anyio's asyncio backend then runs on libuv
         mcp.run()  # stdio transport (default)
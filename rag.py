@@ -4,9 +4,13 @@
 import os
 import time
 import logging
-from typing import Any, Dict, List, Optional
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import httpx
+import orjson
 import chromadb
 from chromadb import Documents, EmbeddingFunction, Embeddings
 
@@ -18,6 +22,21 @@ CHROMA_PATH = os.environ.get("CHROMA_PATH", "./data/chroma")
 COLLECTION_NAME = "bva_rag"
 EMBEDDING_MODEL = "text-embedding-004"  # Vertex AI model
 VERTEX_BATCH_SIZE = 50  # Vertex AI limit per call is 250, stay conservative
+# Optional reduced embedding size (both models support truncated outputs).
+# Smaller vectors shrink the HNSW index and the bandwidth of every query;
+# changing it requires clearing and reindexing the collection.
+EMBED_DIM = int(os.environ.get("RAG_EMBED_DIM", 0)) or None
+# Chunks per upsert/embedding call. OpenAI accepts up to 2048 inputs per call;
+# Vertex caps requests at 250 inputs / 20k tokens, so it keeps VERTEX_BATCH_SIZE.
+UPSERT_BATCH_SIZE = int(os.environ.get("RAG_UPSERT_BATCH", 0)) or None
+# Rough per-call token ceiling (~4 chars/token); larger batches are split
+UPSERT_MAX_TOKENS = 200_000
+# Upsert batches whose embeddings are computed in parallel before being written
+EMBED_CONCURRENCY = int(os.environ.get("RAG_EMBED_CONCURRENCY", 4))
+STATS_TTL = 5.0  # seconds; stats only change when chunks are added or cleared
+STATS_PAGE_SIZE = 10000  # metadata rows fetched per get() when computing stats
+# Per-source / per-content-type chunk counts, kept next to the Chroma DB
+STATS_FILE = os.path.join(CHROMA_PATH, "stats.json")
 
 
 class VertexAIEmbeddingFunction(EmbeddingFunction[Documents]):
@@ -85,15 +104,17 @@ class VertexAIEmbeddingFunction(EmbeddingFunction[Documents]):
             clean = "".join(c for c in t if c in "\n\t\r" or (ord(c) >= 32))
             sanitized.append(clean[:10000] if clean.strip() else "empty")
         instances = [{"content": t} for t in sanitized]
-        payload = {"instances": instances}
+        payload: Dict[str, Any] = {"instances": instances}
+        if EMBED_DIM:
+            payload["parameters"] = {"outputDimensionality": EMBED_DIM}
 
         max_retries = 5
         for attempt in range(1, max_retries + 1):
             with httpx.Client(timeout=60.0) as client:
                 resp = client.post(
                     url,
-                    json=payload,
-                    headers={"Authorization": f"Bearer {token}"},
+                    content=orjson.dumps(payload),
+                    headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"},
                 )
                 if resp.status_code == 429:
                     wait = min(2 ** attempt, 30)
@@ -109,7 +130,8 @@ class VertexAIEmbeddingFunction(EmbeddingFunction[Documents]):
                     raise RuntimeError(f"Vertex AI 400: {error_detail}")
                 resp.raise_for_status()
 
-            predictions = resp.json().get("predictions", [])
+            # orjson decodes the embedding float arrays much faster than stdlib json
+            predictions = orjson.loads(resp.content).get("predictions", [])
             return [p["embeddings"]["values"] for p in predictions]
 
         raise RuntimeError(f"Vertex AI embedding failed after {max_retries} retries (429 rate limit)")
@@ -140,7 +162,7 @@ class OpenAIFallbackEmbeddingFunction(EmbeddingFunction[Documents]):
         if not api_key:
             raise RuntimeError("OPENAI_API_KEY required when RAG_EMBEDDINGS=openai")
         self._fn = OpenAIEmbeddingFunction(
-            api_key=api_key, model_name="text-embedding-3-small"
+            api_key=api_key, model_name="text-embedding-3-small", dimensions=EMBED_DIM
         )
 
     def __call__(self, input: Documents) -> Embeddings:
@@ -163,23 +185,65 @@ def _get_embedding_fn() -> EmbeddingFunction:
 
 _client: Optional[chromadb.ClientAPI] = None
 _collection: Optional[chromadb.Collection] = None
+_embedding_fn: Optional[EmbeddingFunction] = None
+
+# (monotonic timestamp, stats) -- cleared by add_chunks/clear_collection
+_stats_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+# (monotonic timestamp, collection.count()) -- same lifetime as the stats
+_count_cache: Optional[Tuple[float, int]] = None
+_stats_lock = threading.Lock()
+# Bumped by invalidate_stats; a compute that started before an invalidation
+# doesn't store its (possibly pre-write) result.
+_stats_generation = 0
+
+# (by_source, by_content_type) maintained incrementally by add_chunks and
+# persisted to STATS_FILE, so get_stats doesn't scan every chunk's metadata.
+# None until loaded from the file or rebuilt by a scan.
+_breakdown: Optional[Tuple[Counter, Counter]] = None
+_breakdown_lock = threading.Lock()
 
 
 def get_collection() -> chromadb.Collection:
     """Get or create the ChromaDB collection (singleton)."""
-    global _client, _collection
+    global _client, _collection, _embedding_fn
     if _collection is not None:
         return _collection
     _client = chromadb.PersistentClient(path=CHROMA_PATH)
+    _embedding_fn = _get_embedding_fn()
     _collection = _client.get_or_create_collection(
         name=COLLECTION_NAME,
-        embedding_function=_get_embedding_fn(),
+        embedding_function=_embedding_fn,
         metadata={"hnsw:space": "cosine"},
     )
-    logger.info(f"ChromaDB collection '{COLLECTION_NAME}' loaded: {_collection.count()} chunks")
+    logger.info(f"ChromaDB collection '{COLLECTION_NAME}' loaded: {refresh_count()} chunks")
     return _collection
 
 
+def refresh_count() -> int:
+    """Re-read the collection size and cache it."""
+    global _count_cache
+    with _stats_lock:
+        generation = _stats_generation
+    count = get_collection().count()
+    with _stats_lock:
+        if generation == _stats_generation:
+            _count_cache = (time.monotonic(), count)
+    return count
+
+
+def collection_count() -> int:
+    """Collection size, cached for STATS_TTL seconds and dropped on writes.
+
+    The TTL covers writes from another process (e.g. the ingest CLI) sharing
+    CHROMA_PATH; writes through this module invalidate it immediately.
+    """
+    with _stats_lock:
+        cached = _count_cache
+        if cached is not None and time.monotonic() - cached[0] < STATS_TTL:
+            return cached[1]
+    return refresh_count()
+
+
 def search(
     query: str,
     top_k: int = 5,
@@ -189,27 +253,37 @@ def search(
     source: Optional[str] = None,
 ) -> List[Dict[str, Any]]:
     """Embed query and search ChromaDB with optional metadata filters."""
-    collection = get_collection()
+    hits, _ = search_with_total(query, top_k, content_type, part, schedule, source)
+    return hits
 
-    where_clauses = []
-    if content_type:
-        where_clauses.append({"content_type": content_type})
-    if part:
-        where_clauses.append({"part": part})
-    if schedule:
-        where_clauses.append({"schedule": schedule})
-    if source:
-        where_clauses.append({"source": source})
 
+def search_with_total(
+    query: str,
+    top_k: int = 5,
+    content_type: Optional[str] = None,
+    part: Optional[str] = None,
+    schedule: Optional[str] = None,
+    source: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], int]:
+    """Like search(), but also return the (cached) collection size."""
+    collection = get_collection()
+    total = collection_count()
+
+    where_clauses = [
+        {key: value}
+        for key, value in (
+            ("content_type", content_type), ("part", part), ("schedule", schedule), ("source", source),
+        )
+        if value
+    ]
+    # Chroma wants a bare clause for a single filter and $and for several
     where = None
-    if len(where_clauses) == 1:
-        where = where_clauses[0]
-    elif len(where_clauses) > 1:
-        where = {"$and": where_clauses}
+    if where_clauses:
+        where = where_clauses[0] if len(where_clauses) == 1 else {"$and": where_clauses}
 
     kwargs: Dict[str, Any] = {
         "query_texts": [query],
-        "n_results": min(top_k, collection.count() or 1),
+        "n_results": min(top_k, total or 1),
         "include": ["documents", "metadatas", "distances"],
     }
     if where:
@@ -219,7 +293,7 @@ def search(
         results = collection.query(**kwargs)
     except Exception as e:
         logger.error(f"ChromaDB query error: {e}")
-        return []
+        return [], total
 
     hits = []
     if results and results["ids"] and results["ids"][0]:
@@ -232,7 +306,7 @@ def search(
                 "score": round(1.0 - (results["distances"][0][i] or 0), 4),
             })
 
-    return hits
+    return hits, total
 
 
 def add_chunks(chunks: List[Chunk]) -> int:
@@ -250,33 +324,98 @@ def add_chunks(chunks: List[Chunk]) -> int:
     ids = [c.id for c in deduped]
     documents = [c.text for c in deduped]
     metadatas = [c.metadata for c in deduped]
-    batch_size = 50  # smaller batches for Vertex AI embedding calls
+    batches = _upsert_batches(ids, documents, metadatas)
     total = 0
-    max_retries = 3
-    for i in range(0, len(ids), batch_size):
-        batch_ids = ids[i:i + batch_size]
-        batch_docs = documents[i:i + batch_size]
-        batch_meta = metadatas[i:i + batch_size]
-        for attempt in range(1, max_retries + 1):
-            try:
-                collection.upsert(ids=batch_ids, documents=batch_docs, metadatas=batch_meta)
+    breakdown = _current_breakdown(collection, collection_count())
+    # Embedding API round trips dominate; run up to EMBED_CONCURRENCY of them at
+    # once, then write each batch with its precomputed vectors. Chroma writes
+    # stay serial (SQLite), and only one window of vectors is held at a time.
+    with ThreadPoolExecutor(max_workers=EMBED_CONCURRENCY) as ex:
+        for w in range(0, len(batches), EMBED_CONCURRENCY):
+            window = batches[w:w + EMBED_CONCURRENCY]
+            vectors = list(ex.map(lambda b: _with_retries("Embedding", _embedding_fn, b[1]), window))
+            for n, ((batch_ids, batch_docs, batch_meta), embeddings) in enumerate(zip(window, vectors), w + 1):
+                # Upserts may replace existing chunks; their old metadata leaves the tallies
+                replaced = collection.get(ids=batch_ids, include=["metadatas"])["metadatas"] or []
+                _with_retries(
+                    "Upsert", collection.upsert,
+                    ids=batch_ids, embeddings=embeddings, documents=batch_docs, metadatas=batch_meta,
+                )
+                with _breakdown_lock:
+                    _update_breakdown(breakdown, replaced, -1)
+                    _update_breakdown(breakdown, batch_meta, 1)
                 total += len(batch_ids)
-                logger.info(f"Upserted batch {i // batch_size + 1}: {len(batch_ids)} chunks")
-                break
-            except Exception as e:
-                if attempt == max_retries:
-                    logger.error(f"Upsert failed after {max_retries} attempts: {e}")
-                    raise
-                wait = 2 ** attempt
-                logger.warning(f"Upsert attempt {attempt} failed: {e}. Retrying in {wait}s...")
-                time.sleep(wait)
+                logger.info(f"Upserted batch {n}: {len(batch_ids)} chunks")
+    with _breakdown_lock:
+        _save_breakdown(breakdown)
+    invalidate_stats()
     return total
 
 
+def _upsert_batches(
+    ids: List[str], documents: List[str], metadatas: List[Dict[str, Any]],
+) -> List[Tuple[List[str], List[str], List[Dict[str, Any]]]]:
+    """Group chunks into upsert batches by count, cutting early at UPSERT_MAX_TOKENS."""
+    batch_size = UPSERT_BATCH_SIZE
+    if batch_size is None:
+        openai = os.environ.get("RAG_EMBEDDINGS", "vertex").lower() == "openai"
+        batch_size = 500 if openai else VERTEX_BATCH_SIZE
+    batches = []
+    start = 0
+    tokens = 0
+    for i, doc in enumerate(documents):
+        doc_tokens = len(doc) // 4
+        if i > start and (i - start >= batch_size or tokens + doc_tokens > UPSERT_MAX_TOKENS):
+            batches.append((ids[start:i], documents[start:i], metadatas[start:i]))
+            start, tokens = i, 0
+        tokens += doc_tokens
+    if start < len(documents):
+        batches.append((ids[start:], documents[start:], metadatas[start:]))
+    return batches
+
+
+def _with_retries(what: str, fn, *args, max_retries: int = 3, **kwargs):
+    """Call fn, retrying failures with exponential backoff (2s, 4s, ...)."""
+    for attempt in range(1, max_retries + 1):
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            if attempt == max_retries:
+                logger.error(f"{what} failed after {max_retries} attempts: {e}")
+                raise
+            wait = 2 ** attempt
+            logger.warning(f"{what} attempt {attempt} failed: {e}. Retrying in {wait}s...")
+            time.sleep(wait)
+
+
+def invalidate_stats() -> None:
+    """Drop cached stats and count so the next read re-queries the collection."""
+    global _stats_cache, _count_cache, _stats_generation
+    with _stats_lock:
+        _stats_cache = None
+        _count_cache = None
+        _stats_generation += 1
+
+
 def get_stats() -> Dict[str, Any]:
-    """Return index statistics."""
+    """Return index statistics, cached for STATS_TTL seconds."""
+    global _stats_cache
+    with _stats_lock:
+        cached = _stats_cache
+        if cached is not None and time.monotonic() - cached[0] < STATS_TTL:
+            return cached[1]
+        generation = _stats_generation
+    stats = _compute_stats()
+    with _stats_lock:
+        if generation == _stats_generation:
+            _stats_cache = (time.monotonic(), stats)
+    return stats
+
+
+def _compute_stats() -> Dict[str, Any]:
+    """Count chunks and group them by source/content type."""
     collection = get_collection()
-    total = collection.count()
+    total = refresh_count()
 
     embedding_provider = os.environ.get("RAG_EMBEDDINGS", "vertex").lower()
     stats: Dict[str, Any] = {
@@ -284,6 +423,7 @@ def get_stats() -> Dict[str, Any]:
         "collection": COLLECTION_NAME,
         "embedding_model": EMBEDDING_MODEL if embedding_provider != "openai" else "text-embedding-3-small",
         "embedding_provider": embedding_provider,
+        "embedding_dim": EMBED_DIM,
         "chroma_path": CHROMA_PATH,
         "by_source": {},
         "by_content_type": {},
@@ -291,27 +431,110 @@ def get_stats() -> Dict[str, Any]:
 
     if total > 0:
         try:
-            all_data = collection.get(include=["metadatas"], limit=total)
-            if all_data and all_data["metadatas"]:
-                for meta in all_data["metadatas"]:
-                    src = meta.get("source", "unknown")
-                    ct = meta.get("content_type", "unknown")
-                    stats["by_source"][src] = stats["by_source"].get(src, 0) + 1
-                    stats["by_content_type"][ct] = stats["by_content_type"].get(ct, 0) + 1
+            by_source, by_content_type = _current_breakdown(collection, total)
+            with _breakdown_lock:
+                stats["by_source"] = dict(by_source)
+                stats["by_content_type"] = dict(by_content_type)
         except Exception as e:
             logger.warning(f"Could not compute stats breakdown: {e}")
 
     return stats
 
 
+def _update_breakdown(breakdown: Tuple[Counter, Counter], metas: List[Dict[str, Any]], sign: int) -> None:
+    """Add (sign=1) or remove (sign=-1) chunks' metadata from the tallies."""
+    by_source, by_content_type = breakdown
+    for meta in metas:
+        if not meta:
+            continue
+        by_source[meta.get("source", "unknown")] += sign
+        by_content_type[meta.get("content_type", "unknown")] += sign
+    if sign < 0:
+        for counts in breakdown:
+            for key in [k for k, v in counts.items() if v <= 0]:
+                del counts[key]
+
+
+def _scan_breakdown(collection: chromadb.Collection, total: int) -> Tuple[Counter, Counter]:
+    """Tally every chunk's metadata, paging so a large index isn't materialized at once."""
+    breakdown: Tuple[Counter, Counter] = (Counter(), Counter())
+    for offset in range(0, total, STATS_PAGE_SIZE):
+        page = collection.get(include=["metadatas"], limit=STATS_PAGE_SIZE, offset=offset)
+        metas = page["metadatas"] if page else None
+        if not metas:
+            break
+        _update_breakdown(breakdown, metas, 1)
+    return breakdown
+
+
+def _load_breakdown() -> Optional[Tuple[Counter, Counter]]:
+    try:
+        with open(STATS_FILE, "rb") as f:
+            data = orjson.loads(f.read())
+        return Counter(data["by_source"]), Counter(data["by_content_type"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _save_breakdown(breakdown: Tuple[Counter, Counter]) -> None:
+    tmp = STATS_FILE + ".tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(orjson.dumps({"by_source": breakdown[0], "by_content_type": breakdown[1]}))
+        os.replace(tmp, STATS_FILE)
+    except OSError as e:
+        logger.warning(f"Could not persist stats to {STATS_FILE}: {e}")
+
+
+def _current_breakdown(collection: chromadb.Collection, total: int) -> Tuple[Counter, Counter]:
+    """Return the tallies, reloading or rescanning if they don't add up to total.
+
+    A mismatch means another process (e.g. the ingest CLI) changed the
+    collection; its persisted file is tried before falling back to a scan.
+    """
+    global _breakdown
+    with _breakdown_lock:
+        breakdown = _breakdown
+        if breakdown is None or sum(breakdown[0].values()) != total:
+            breakdown = _load_breakdown()
+            if breakdown is None or sum(breakdown[0].values()) != total:
+                logger.info(f"Rebuilding RAG stats breakdown from {total} chunks")
+                breakdown = _scan_breakdown(collection, total)
+                _save_breakdown(breakdown)
+            _breakdown = breakdown
+        return breakdown
+
+
+def existing_ids() -> Set[str]:
+    """Return the IDs of every chunk currently in the collection."""
+    collection = get_collection()
+    ids: Set[str] = set()
+    for offset in range(0, collection.count(), STATS_PAGE_SIZE):
+        page = collection.get(include=[], limit=STATS_PAGE_SIZE, offset=offset)["ids"]
+        if not page:
+            break
+        ids.update(page)
+    return ids
+
+
 def clear_collection() -> int:
     """Delete all chunks. Returns previous count."""
-    global _collection
+    global _collection, _breakdown
     collection = get_collection()
     count = collection.count()
-    if count > 0:
-        all_ids = collection.get(include=[])["ids"]
-        if all_ids:
-            collection.delete(ids=all_ids)
+    # Delete a page at a time; each delete shifts the rest down to offset 0.
+    # Bounded by the starting count so a no-op delete can't loop forever.
+    for _ in range(0, count, STATS_PAGE_SIZE):
+        page = collection.get(include=[], limit=STATS_PAGE_SIZE)["ids"]
+        if not page:
+            break
+        collection.delete(ids=page)
+    with _breakdown_lock:
+        _breakdown = (Counter(), Counter())
+        try:
+            os.remove(STATS_FILE)
+        except FileNotFoundError:
+            pass
+    invalidate_stats()
     logger.info(f"Cleared {count} chunks from collection")
     return count
@@ -0,0 +1,107 @@
+"""Offline tests for app endpoints that don't hit upstream services."""
+from fastapi.testclient import TestClient
+
+from app import app
+
+client = TestClient(app)
+
+
+def test_cfr_dc_batch_resolves_known_codes():
+    resp = client.get("/cfr/dc/batch", params=[("codes", "9411"), ("codes", "6260")])
+    assert resp.status_code == 200
+    data = resp.json()
+    assert [r["dc"] for r in data["results"]] == ["9411", "6260"]
+    assert data["results"][0]["cfr_citation"] == "38 CFR § 4.130"
+    assert data["not_found"] == []
+
+
+def test_cfr_dc_batch_reports_unknown_codes():
+    resp = client.get("/cfr/dc/batch", params=[("codes", "9411"), ("codes", "0000")])
+    assert resp.status_code == 200
+    data = resp.json()
+    assert [r["dc"] for r in data["results"]] == ["9411"]
+    assert data["not_found"] == ["0000"]
+
+
+def test_cfr_dc_batch_requires_codes():
+    resp = client.get("/cfr/dc/batch")
+    assert resp.status_code == 422
+
+
+def test_cfr_dc_single_still_routes():
+    resp = client.get("/cfr/dc/9411")
+    assert resp.status_code == 200
+    assert resp.json()["condition"] == "PTSD"
+
+
+def test_parse_decision_text_outcome_and_citations():
+    from app import parse_decision_text
+
+    text = (
+        "Decision Date: 01/02/2019\n"
+        "ORDER\nService connection for tinnitus is GRANTED.\n"
+        "The claim for a higher rating is REMANDED.\n"
+        "See 38 CFR § 3.310 and M21-1, III.iv.4.\n"
+    )
+    d = parse_decision_text(text)
+    assert d["decision_date"] == "2019-01-02"
+    assert d["outcome"] == "Mixed"
+    assert "38 CFR ss 3.310" in d["citations"]
+    assert parse_decision_text("The appeal is denied.")["outcome"] == "Denied"
+
+
+def test_parse_decision_text_citations_keep_document_order():
+    from app import parse_decision_text
+
+    text = "Under 38 CFR § 4.130 and 38 CFR § 3.310, and again 38 CFR § 4.130 here"
+    assert parse_decision_text(text)["citations"] == ["38 CFR ss 4.130", "38 CFR ss 3.310"]
+
+
+def test_clean_snippet_matches_regex_cleanup():
+    import re
+    from app import clean_snippet
+
+    pattern = re.compile(r"[\xee\x80-\x83\xdc\x80-\xbf]|\uE000|\uE001")
+    samples = [
+        "tinnitus was granted",
+        "service\xee\x80\x80connected \xdc\x81rating",
+        "".join(chr(c) for c in range(0x70, 0x110)) + "\uE000\uE001\uE002",
+        "plain text é ü ñ",
+    ]
+    for s in samples:
+        assert clean_snippet(s) == pattern.sub("", s)
+
+
+def test_cfr_structure_revalidates_with_etag(monkeypatch):
+    import app as app_module
+
+    app_module._structure_json_cache.clear()
+    monkeypatch.setattr(
+        app_module, "_ecfr_structure_sync",
+        lambda: app_module.CFRStructureResponse(title=38, date="2024-01-01", parts=[], retrieved_at="2024-01-01T00:00:00"),
+    )
+    try:
+        first = client.get("/cfr/structure")
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+        again = client.get("/cfr/structure", headers={"If-None-Match": etag})
+        assert again.status_code == 304
+        assert again.content == b""
+    finally:
+        app_module._structure_json_cache.clear()
+
+
+def test_rag_status_etag_tracks_content(monkeypatch):
+    import app as app_module
+
+    stats = {"total_chunks": 3, "collection": "bva", "embedding_model": "m",
+             "by_source": {"cfr": 2, "knowva": 1}, "by_content_type": {"rating_criteria": 3}}
+    monkeypatch.setattr(app_module._rag, "get_stats", lambda: dict(stats))
+    first = client.get("/rag/status")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert client.get("/rag/status", headers={"If-None-Match": etag}).status_code == 304
+    stats["total_chunks"] = 4
+    changed = client.get("/rag/status", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
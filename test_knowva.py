@@ -1,5 +1,9 @@
 """Quick smoke test for KnowVA API endpoints."""
-import requests, json
+import os, shelve, threading
+import orjson, requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 KNOWVA_BASE = "https://www.knowva.ebenefits.va.gov/system/ws/v11"
 PORTAL_ID = "554400000001018"
@@ -11,59 +15,108 @@ HEADERS = {
     "Origin": "https://www.knowva.ebenefits.va.gov",
 }
 
+# One keep-alive session so the checks share a TLS connection to KnowVA.
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=2, pool_maxsize=8,
+    max_retries=Retry(total=3, backoff_factor=0.3,
+                      status_forcelist=(429, 500, 502, 503, 504),
+                      raise_on_status=False),
+))
 
-def get(path, extra={}):
-    resp = requests.get(f"{KNOWVA_BASE}/{path}", params={**COMMON, **extra},
-                        headers=HEADERS, timeout=15)
+
+# Optional on-disk validator cache (set KNOWVA_CACHE=<path>): repeat runs send
+# If-None-Match/If-Modified-Since and reuse the stored body on a 304.
+CACHE_PATH = os.environ.get("KNOWVA_CACHE")
+_CACHE_LOCK = threading.Lock()
+
+# Fully merged query params per endpoint, built once at import.
+TOPIC_PARAMS = {**COMMON, "$attribute": "name,id,parentTopicId,totalArticleCount",
+                "$level": 0, "$pagenum": 0, "$pagesize": 1000}
+SEARCH_PARAMS = {**COMMON, "$attribute": "name,id,snippet", "$pagenum": 1,
+                 "$pagesize": 5, "federated": "true"}
+ARTICLE_PARAMS = {**COMMON, "$attribute": "name,id,lastModifiedDate,contentText"}
+POPULAR_PARAMS = {**COMMON, "$attribute": "name,id,milestone", "$pagenum": 1, "$pagesize": 5}
+
+
+def get(path, params=COMMON):
+    key = repr((path, sorted(params.items())))
+    stored = None
+    if CACHE_PATH:
+        with _CACHE_LOCK, shelve.open(CACHE_PATH) as db:
+            stored = db.get(key)
+    headers = {}
+    if stored:
+        if stored["etag"]:
+            headers["If-None-Match"] = stored["etag"]
+        if stored["last_modified"]:
+            headers["If-Modified-Since"] = stored["last_modified"]
+    resp = SESSION.get(f"{KNOWVA_BASE}/{path}", params=params, headers=headers, timeout=15)
+    if resp.status_code == 304 and stored:
+        return orjson.loads(stored["body"])
     resp.raise_for_status()
-    return resp.json()
+    etag, last_modified = resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+    if CACHE_PATH and (etag or last_modified):
+        with _CACHE_LOCK, shelve.open(CACHE_PATH) as db:
+            db[key] = {"etag": etag, "last_modified": last_modified, "body": resp.content}
+    return orjson.loads(resp.content)
 
 
-def test_topics():
-    data = get("ss/topic", {"$attribute": "name,id,parentTopicId,totalArticleCount",
-                             "$level": 0, "$pagenum": 0, "$pagesize": 1000})
+def test_topics(out=print):
+    data = get("ss/topic", TOPIC_PARAMS)
     raw = data.get("topicTree", [])
-    print(f"Topics: {len(raw)}")
+    out(f"Topics: {len(raw)}")
     for entry in raw[:5]:
         t = entry.get("topic", entry)
-        print(f"  [{t['id']}] {t['name']} ({t.get('articleTotalCount', 0)} articles)")
+        out(f"  [{t['id']}] {t['name']} ({t.get('articleTotalCount', 0)} articles)")
     return raw
 
 
-def test_search(q="PTSD"):
-    data = get("ss/search/kb", {"$attribute": "name,id,snippet", "$pagenum": 1,
-                                 "$pagesize": 5, "federated": "true", "q": q})
+def test_search(q="PTSD", out=print):
+    data = get("ss/search/kb", {**SEARCH_PARAMS, "q": q})
     top_keys = list(data.keys())[:5]
     raw = data.get("article", data.get("items", []))
     total = data.get("totalCount", data.get("count", len(raw)))
-    print(f"\nSearch '{q}': total={total}, keys={top_keys}, results={len(raw)}")
+    out(f"\nSearch '{q}': total={total}, keys={top_keys}, results={len(raw)}")
     for r in raw[:3]:
-        print(f"  [{r['id']}] {r['name'][:80]}")
+        out(f"  [{r['id']}] {r['name']:.80}")
     return data
 
 
-def test_article(article_id=554400000073398):
-    data = get(f"ss/article/{article_id}", {"$attribute": "name,id,lastModifiedDate,contentText"})
+def test_article(article_id=554400000073398, out=print):
+    data = get(f"ss/article/{article_id}", ARTICLE_PARAMS)
     raw = data.get("article", [data])
     a = raw[0] if raw else {}
     text = a.get("contentText", "")
-    print(f"\nArticle {article_id}: {a.get('name', '')[:80]}")
-    print(f"  Content: {len(text)} chars  |  preview: {text[:150]}")
+    out(f"\nArticle {article_id}: {a.get('name', ''):.80}")
+    out(f"  Content: {len(text)} chars  |  preview: {text:.150}")
     return a
 
 
-def test_popular():
-    data = get("ss/dfaq", {"$attribute": "name,id,milestone", "$pagenum": 1, "$pagesize": 5})
+def test_popular(out=print):
+    data = get("ss/dfaq", POPULAR_PARAMS)
     raw = data.get("article", data.get("items", []))
-    print(f"\nPopular: {len(raw)} articles")
+    out(f"\nPopular: {len(raw)} articles")
     for r in raw:
-        print(f"  [{r['id']}] {r['name'][:80]}")
+        out(f"  [{r['id']}] {r['name']:.80}")
     return raw
 
 
+def _buffered(check, *args):
+    """Run a check with its report collected, so concurrent checks don't interleave."""
+    lines = []
+    check(*args, out=lines.append)
+    return lines
+
+
 if __name__ == "__main__":
-    test_topics()
-    test_search("PTSD")
-    test_article()
-    test_popular()
+    # The four calls are independent; run them side by side so the script
+    # takes about as long as the slowest one rather than the sum.
+    # Reports are printed in submission order once each check finishes.
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        futures = [ex.submit(_buffered, test_topics), ex.submit(_buffered, test_search, "PTSD"),
+                   ex.submit(_buffered, test_article), ex.submit(_buffered, test_popular)]
+        for f in futures:
+            print("\n".join(f.result()))
     print("\nAll OK.")